@@ -23,17 +23,52 @@ it's written in **Python**.
 	resulting in application getting blocked while the code is executed.
 	| To prevent this the :class:`TCPServer`class code is executed in a separate thread using the 
 	:mod:`SocketServer`.
+	| The server can run in two listener modes: **Single** where connections are handled one after the other by the
+	server thread and **ThreadPool** where a bounded pool of worker threads handles them concurrently, preventing a
+	client holding its connection open from blocking the other ones.
+	| Those listener modes belong to the **SocketServer** engine, the **Asyncore** engine serves every connection from
+	a single event loop thread instead: The requests handlers are fed with the data as it arrives, responses are
+	buffered and written when the sockets are writable and the pending connections are cancelled when the server stops.
+	Many short lived connections are accepted without a thread per connection, however with the **Block** overload
+	policy a full requests stack pauses the whole event loop.
+	| Clients running on the same workstation can bypass the loopback network stack with the **Local** transport: The
+	server listens on a Unix domain socket named after the port in the temporary directory, for example
+	"/tmp/TCPServer_12288.sock", or on a "\\\\.\\pipe\\TCPServer_12288" named pipe on Windows, the **pywin32** package
+	being required. The requests handlers behave the same whatever the transport:
+
+		>>> connection = open(r"\\\\.\\pipe\\TCPServer_12288", "r+b", 0)
+		>>> connection.write("JScript | LogMessage(\"Pouet\")")
+		>>> connection.close()
 	| One of the major issue encountered while implementing the server was because the client code was getting executed
 	into the server thread resulting in random application crashes.
 	| The trick to avoid this has been to create a global requests stack using :class:`collections.deque` class shared
 	between the main application thread and the server thread, then a timer event poll the data on a regular interval and
 	process it.
+	| Additional listeners can run along the main server, they are defined in the **Listeners** setting as semicolon
+	separated "Handler [Address:]Port [engine=Engine] [mode=Mode] [workers=Workers] [itemsBudget=Budget]" entries, for
+	example: "FramedStackDataRequestsHandler 12289 engine=Asyncore; StatisticsRequestsHandler 12290". Each listener
+	has its own requests queue, the queues are drained in turn by the timer event, one request at a time and within
+	their own items budget.
+	| The requests stack is now a bounded :class:`RequestsQueue` class instance: once its capacity is reached, the
+	server threads either block, reject the incoming requests or drop the oldest ones depending the overload policy.
+	| Requests are stacked in **High**, **Normal** or **Low** priority lanes, higher priority lanes being served first.
+	A request that has been waiting in a lower priority lane for longer than the **Starvation Timeout** setting more
+	than the next higher priority request is served before it, a zero timeout giving strict priorities. Priorities
+	apply within a requests queue: Each listener having its own queue, the share of the timer event a listener gets
+	is set by its items budget.
+	| The timer event polling the requests stack is adaptive: it runs on a short interval while requests are flowing
+	and backs off toward a maximum interval when the server is idle, the policy is defined in the settings. The
+	maximum interval bounds the latency of the first request reaching an idle server.
 	| Another issue was the scopes oddities happening within the code and especially inside the PPG logic. It seems that
 	the PPG logic definitions are called in another scope than the module one, making it hard to access module objects and
 	annoying if you don't want to expose everything in application commands.
 	| Hopefully, thanks to **Python** introspection it's possible to retrieve the correct module object. For that,
-	a global :data:`__uid__` attribute is defined, then the list of objects handled by the garbage collector is traversed
-	until one with the attribute is found. See :def:`_getModule` definition for more details.
+	a global :data:`__uid__` attribute is defined, the module object is looked up once among the garbage collector
+	referrers of the module namespace when the plugin is loaded and registered in :data:`sys.modules` under that
+	identifier, making any later retrieval a dictionary lookup. See :def:`_getModule` definition for more details.
+	| The requests handlers offered in the settings are the ones registered in the
+	:class:`RequestsHandlersRegistry` class instance, a custom handler is made available with its
+	:meth:`RequestsHandlersRegistry.register` method.
 	| An alternate design using the plugin **UserData** attribute has been tested but never managed to wrap correcly
 	the :class:`collections.deque` class inside a COM object.
 
@@ -60,13 +95,17 @@ it's written in **Python**.
 		'Hello World!'
 		>>> connection.close()
 
+	The :class:`StatisticsRequestsHandler` class answers any received data with the server statistics as a **JSON**
+	line.
+
 	The :class:`DefaultStackDataRequestsHandler` class handles two types of string formatting:
 
 		- An existing script file path: "C://MyScript//PythonScript.py" in that case the script would be executed as
-		a **Python** script by the application.
+		a **Python** script by the application. Scripts are cached in memory until they are modified.
 
 		- A string with the following formatting: "Language | Code", "JScript | LogMessage(\"Pouet!\")" in that case
 		the given code would be executed as **Python** JScript by the application resulting in **Pouet!** being logged.
+		Extra languages can be registered with the **TCPServer_registerLanguage** command.
 
 	Example client code:
 
@@ -92,16 +131,89 @@ it's written in **Python**.
 
 	The :class:`PythonStackDataRequestsHandler` class that will aggregate the data the client send until it encounters the
 	:attr:`PythonStackDataRequestsHandler.requestEnd` attribute and then executes the given data as **Python** code.
+	| The connection is closed once a request end has been received, requests sent together are all executed.
+	Connections starting with the :attr:`PythonStackDataRequestsHandler.keepAlive` attribute stay open after each
+	request end instead, any number of requests can then be sent in sequence without waiting for their execution.
+	Data left without request end when the client closes the connection is executed too.
+	| When the **Streaming Execution** and **Compiled Execution** settings are enabled, the complete top level blocks
+	of a large request are compiled and stacked as they arrive instead of once the request end is received: Transfer
+	and execution overlap and only the incomplete block is kept in memory. The blocks share the persistent namespace.
+
+	Example client code:
+
+		>>> import socket
+		>>> connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+		>>> connection.connect(("127.0.0.1", 12288))
+		>>> connection.send("<!KA>import sys\nprint sys.maxint<!RE>")
+		38
+		>>> connection.send("print sys.version<!RE>print sys.platform<!RE>")
+		45
+		>>> connection.close()
+
+	The :class:`FramedStackDataRequestsHandler` class reads frames made of a header, packed with the
+	:attr:`FramedStackDataRequestsHandler.header` structure ( Payload size, request identifier and flags ), followed
+	by the payload, then executes the payload as **Python** code. Any number of frames can be sent on a connection.
+	| Each request is answered with a frame carrying the same identifier and a **JSON** payload with the execution
+	return value, error, latency and duration, the error flag being set in the header if the execution failed.
 
 	Example client code:
 
+		>>> import json
 		>>> import socket
+		>>> import struct
 		>>> connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 		>>> connection.connect(("127.0.0.1", 12288))
-		>>> connection.send("import sys\nprint sys.maxint<!RE>")
-		33
+		>>> data = "import sys\nprint sys.maxint"
+		>>> connection.sendall(struct.pack("!IIH", len(data), 1, 0) + data)
+		>>> size, identifier, flags = struct.unpack("!IIH", connection.recv(10))
+		>>> json.loads(connection.recv(size))["error"]
 		>>> connection.close()
 
+	| When the **Compiled Execution** setting is enabled, **Python** payloads are compiled in process, cached by content
+	digest and executed in a persistent namespace, the value of single expressions being returned. The response
+	carries the payload digest, a frame with the :attr:`FramedStackDataRequestsHandler.digestFlag` flag set and the
+	digest as payload executes the cached code again without resending it.
+	| A frame with the :attr:`FramedStackDataRequestsHandler.statisticsFlag` flag set is immediately answered with the
+	server statistics, also available through the **TCPServer_stats** command.
+	| A frame with the :attr:`FramedStackDataRequestsHandler.keyFlag` flag set carries a key before its code, the key
+	length being stored in the first payload byte: A keyed request replaces the pending request with the same key, the
+	replaced request being answered with a **superseded** response. When the **Deduplication Window** setting is not
+	zero, a request identical to a pending request stacked within the window is not executed again but answered with
+	the pending request response.
+	| Large data is not sent through the connection: A frame with the
+	:attr:`FramedStackDataRequestsHandler.sharedBufferFlag` flag set carries a **JSON** descriptor before its code, the
+	descriptor length being stored in the first two payload bytes. The described memory mapped file, or named shared
+	memory on Windows, is mapped read only and bound to the **sharedBuffer** variable while the code is executed in
+	process, whatever the **Compiled Execution** setting, giving a zero copy :class:`buffer` over hundreds of megabytes.
+	| A frame with the :attr:`FramedStackDataRequestsHandler.helloFlag` flag set and a **JSON** payload listing the
+	compressions supported by the client, for example {"compression": ["zlib"]}, is answered with the accepted
+	compression, the **Compression Threshold** setting and the count of connections the listener serves concurrently,
+	0 meaning unbounded: A client pool does not open more connections than that. Frames with the
+	:attr:`FramedStackDataRequestsHandler.compressedFlag` flag set carry a **zlib** compressed payload, inflated as
+	its chunks arrive, the client leaving the payloads smaller than the threshold uncompressed.
+	| Frames are stacked in the **Normal** priority lane unless the
+	:attr:`FramedStackDataRequestsHandler.highPriorityFlag` or :attr:`FramedStackDataRequestsHandler.lowPriorityFlag`
+	flag is set. Frames with the :attr:`FramedStackDataRequestsHandler.backgroundFlag` flag set are not stacked but
+	executed right away by a pool of **Background Workers** threads, in their own persistent namespace without the
+	**Application** objects: They are meant for computations and file operations that do not touch the scene.
+	| Requests drained in a timer event tick are executed in a single batch scope when the **Batch Execution** setting
+	is enabled, or as soon as one of them has the :attr:`FramedStackDataRequestsHandler.batchFlag` flag set: A single
+	undo entry is recorded, commands logging and auto inspection are suspended, and the viewports are refreshed once.
+	Commands logging and auto inspection are restored once a tick executes no batch, or on next startup when the
+	session ended in between.
+	| The **TCPClient** module shipped in the addon **Data/Scripts** directory implements this protocol with a pool of
+	persistent connections, sending requests in batches and reconnecting broken connections:
+
+		>>> import TCPClient
+		>>> with TCPClient.ConnectionPool([("127.0.0.1", 12288)]) as pool:
+		...	pool.execute("import sys\nsys.maxint")
+		2147483647
+	| Connections without any traffic nor pending response for longer than the **Idle Timeout** setting are closed by
+	the server, a zero timeout keeps them open until the client closes them.
+	| Settings changes are cached in memory and written to the preferences in a single batch once they have settled
+	for a second or when the plugin is unloaded. When the **Settings Mirror** setting is enabled, they are also written
+	to the addon **Data/TCPServer_settings.json** file, read instead of the preferences by batch sessions.
+
 **Others:**
 
 """
@@ -114,16 +226,40 @@ from __future__ import unicode_literals
 #**********************************************************************************************************************
 #***	External imports.
 #**********************************************************************************************************************
+import Queue
 import SocketServer
+import asyncore
 import collections
-import inspect
+import errno
+import hashlib
 import os
 import re
+import select
 import socket
+import stat
+import sys
 import itertools
+import json
+import math
+import mmap
+import struct
 import threading
+import time
+import traceback
+import types
+import weakref
+import zlib
 from win32com.client import constants as siConstants
 
+try:
+	import pywintypes
+	import win32event
+	import win32file
+	import win32pipe
+	import winerror
+except ImportError:
+	win32pipe = None
+
 #**********************************************************************************************************************
 #***	Module attributes.
 #**********************************************************************************************************************
@@ -135,125 +271,2943 @@ __email__ = "thomas.mansencal@gmail.com"
 __status__ = "Production"
 
 __uid__ = "ab7c34a670c7737f491edfd2939201c4"
+__loadStart__ = time.time()
+
+__all__ = ["ProgrammingError",
+		"AbstractServerError",
+		"ServerOperationError",
+		"CacheMissError",
+		"Histogram",
+		"Metrics",
+		"InstrumentedTCPServer",
+		"ThreadPoolTCPServer",
+		"InstrumentedUnixStreamServer",
+		"ThreadPoolUnixStreamServer",
+		"AbstractServerEngine",
+		"SocketServerEngine",
+		"AsyncoreWaker",
+		"AsyncoreListener",
+		"AsyncoreChannel",
+		"AsyncoreServerEngine",
+		"NamedPipeConnection",
+		"NamedPipeServerEngine",
+		"Request",
+		"RequestsQueue",
+		"BatchScope",
+		"TimerScheduler",
+		"ResponsesWriter",
+		"WorkersPool",
+		"LRUCache",
+		"MappedBuffer",
+		"PythonExecutor",
+		"BackgroundPythonExecutor",
+		"LanguagesDispatcher",
+		"EchoRequestsHandler",
+		"StatisticsRequestsHandler",
+		"LoggingStackDataRequestsHandler",
+		"DefaultStackDataRequestsHandler",
+		"PythonStackDataRequestsHandler",
+		"FramedStackDataRequestsHandler",
+		"RequestsHandlersRegistry",
+		"SettingsStore",
+		"Constants",
+		"Runtime",
+		"TCPServer",
+		"XSILoadPlugin",
+		"XSIUnloadPlugin"]
+
+#**********************************************************************************************************************
+#***	Module classes and definitions.
+#**********************************************************************************************************************
+class ProgrammingError(Exception):
+	pass
+
+class AbstractServerError(Exception):
+	pass
+
+class ServerOperationError(AbstractServerError):
+	pass
+
+class CacheMissError(AbstractServerError):
+	pass
+
+class Histogram(object):
+
+	__slots__ = ("count", "total", "maximum", "buckets")
+
+	def __init__(self):
+		self.count = 0
+		self.total = 0.
+		self.maximum = 0.
+		self.buckets = collections.defaultdict(int)
+
+	def add(self, value):
+		# Values are binned by power of two, keeping the histogram cost constant whatever the values range.
+		self.count += 1
+		self.total += value
+		self.maximum = max(self.maximum, value)
+		self.buckets[math.frexp(value)[1]] += 1
+
+	def getPercentile(self, percentile):
+		if not self.count:
+			return 0.
+
+		threshold = self.count * percentile / 100.
+		count = 0
+		for exponent in sorted(self.buckets):
+			count += self.buckets[exponent]
+			if count >= threshold:
+				return min(math.ldexp(1., exponent), self.maximum)
+		return self.maximum
+
+	def getSummary(self):
+		return {"count": self.count,
+				"average": self.total / self.count if self.count else 0.,
+				"maximum": self.maximum,
+				"p50": self.getPercentile(50),
+				"p90": self.getPercentile(90),
+				"p99": self.getPercentile(99)}
+
+class Metrics(object):
+
+	def __init__(self):
+		self.__lock = threading.Lock()
+		self.__counters = collections.defaultdict(int)
+		self.__gauges = {}
+		self.__histograms = collections.defaultdict(Histogram)
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def increment(self, name, value=1):
+		with self.__lock:
+			self.__counters[name] += value
+
+	def gauge(self, name, value):
+		self.__gauges[name] = value
+
+	def observe(self, name, value):
+		with self.__lock:
+			self.__histograms[name].add(value)
+
+	def getSnapshot(self):
+		with self.__lock:
+			return {"counters": dict(self.__counters),
+					"gauges": dict(self.__gauges),
+					"histograms": dict([(name, histogram.getSummary())
+										for name, histogram in self.__histograms.iteritems()])}
+
+	def reset(self):
+		with self.__lock:
+			self.__counters.clear()
+			self.__histograms.clear()
+		return True
+
+class InstrumentedTCPServer(SocketServer.TCPServer):
+
+	# The default listen backlog of 5 connections drops connection attempts when many clients connect at once.
+	request_queue_size = 128
+	# Connections served concurrently, advertised to the clients so that they do not open connections left waiting.
+	connections = 1
+	idleTimeout = None
+	requestsStack = None
+
+	def verify_request(self, request, clientAddress):
+		Runtime.metrics.increment("connectionsAccepted")
+		return True
+
+	def finish_request(self, request, clientAddress):
+		Runtime.metrics.increment("connectionsActive")
+		request.settimeout(self.idleTimeout)
+		if self.address_family == socket.AF_INET:
+			# Small responses written while the client acknowledges the previous ones would be delayed by Nagle's
+			# algorithm.
+			request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+		start = _getTime()
+		try:
+			SocketServer.TCPServer.finish_request(self, request, clientAddress)
+		except socket.timeout:
+			Runtime.metrics.increment("connectionsTimedOut")
+		finally:
+			Runtime.metrics.increment("connectionsActive", -1)
+			Runtime.metrics.observe("connectionDuration", (_getTime() - start) * 1000.)
+
+class ThreadPoolTCPServer(InstrumentedTCPServer):
+
+	workers = 16
+
+	def __init__(self, serverAddress, requestHandlerClass, workers=None):
+		# The workers are started once the server is bound, a failed binding closes the server from the constructor.
+		self.__requests = Queue.Queue()
+		self.__workers = []
+
+		InstrumentedTCPServer.__init__(self, serverAddress, requestHandlerClass)
+
+		self.connections = workers or self.workers
+		for i in range(workers or self.workers):
+			worker = threading.Thread(target=self.__processRequests)
+			worker.setDaemon(True)
+			worker.start()
+			self.__workers.append(worker)
+
+	def process_request(self, request, clientAddress):
+		# Connections are queued and served by the first available worker, a client holding its connection open only
+		# occupies one worker instead of blocking the whole server.
+		self.__requests.put((request, clientAddress))
+
+	def server_close(self):
+		InstrumentedTCPServer.server_close(self)
+		# The connections still waiting for a worker are closed, their clients would wait for them forever otherwise.
+		while True:
+			try:
+				item = self.__requests.get_nowait()
+			except Queue.Empty:
+				break
+
+			item is not None and self.shutdown_request(item[0])
+		for worker in self.__workers:
+			self.__requests.put(None)
+		self.__workers = []
+
+	def __processRequests(self):
+		while True:
+			item = self.__requests.get()
+			if item is None:
+				break
+
+			request, clientAddress = item
+			try:
+				self.finish_request(request, clientAddress)
+			except Exception:
+				self.handle_error(request, clientAddress)
+			finally:
+				self.shutdown_request(request)
+
+class InstrumentedUnixStreamServer(InstrumentedTCPServer):
+
+	address_family = getattr(socket, "AF_UNIX", None)
+
+class ThreadPoolUnixStreamServer(ThreadPoolTCPServer):
+
+	address_family = getattr(socket, "AF_UNIX", None)
+
+class AbstractServerEngine(object):
+
+	def __init__(self, address, port, handler, idleTimeout=0, requestsStack=None, transport="TCP"):
+		self.__address = address
+		self.__port = port
+		self.__handler = handler
+		self.__idleTimeout = idleTimeout
+		self.__requestsStack = requestsStack
+		self.__transport = transport
+
+	#******************************************************************************************************************
+	#***	Attributes properties.
+	#******************************************************************************************************************
+	@property
+	def address(self):
+		return self.__address
+
+	@address.setter
+	def address(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "address"))
+
+	@address.deleter
+	def address(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "address"))
+
+	@property
+	def port(self):
+		return self.__port
+
+	@port.setter
+	def port(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "port"))
+
+	@port.deleter
+	def port(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "port"))
+
+	@property
+	def handler(self):
+		return self.__handler
+
+	@handler.setter
+	def handler(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "handler"))
+
+	@handler.deleter
+	def handler(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "handler"))
+
+	@property
+	def idleTimeout(self):
+		return self.__idleTimeout
+
+	@idleTimeout.setter
+	def idleTimeout(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "idleTimeout"))
+
+	@idleTimeout.deleter
+	def idleTimeout(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "idleTimeout"))
+
+	@property
+	def requestsStack(self):
+		return self.__requestsStack
+
+	@requestsStack.setter
+	def requestsStack(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "requestsStack"))
+
+	@requestsStack.deleter
+	def requestsStack(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(
+		self.__class__.__name__, "requestsStack"))
+
+	@property
+	def transport(self):
+		return self.__transport
+
+	@transport.setter
+	def transport(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "transport"))
+
+	@transport.deleter
+	def transport(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "transport"))
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def start(self):
+		raise NotImplementedError("{0} | '{1}' method must be implemented by '{2}' subclasses!".format(
+		self.__class__.__name__, "start", AbstractServerEngine.__name__))
+
+	def stop(self):
+		raise NotImplementedError("{0} | '{1}' method must be implemented by '{2}' subclasses!".format(
+		self.__class__.__name__, "stop", AbstractServerEngine.__name__))
+
+class SocketServerEngine(AbstractServerEngine):
+
+	def __init__(self,
+				address,
+				port,
+				handler,
+				mode="Single",
+				workers=None,
+				idleTimeout=0,
+				requestsStack=None,
+				transport="TCP"):
+		AbstractServerEngine.__init__(self, address, port, handler, idleTimeout, requestsStack, transport)
+
+		self.__mode = mode
+		self.__workers = workers
+
+		self.__server = None
+		self.__worker = None
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def start(self):
+		if self.transport == "Local":
+			address = _getLocalAddress(self.port)
+			_removeLocalAddress(address)
+			servers = (ThreadPoolUnixStreamServer, InstrumentedUnixStreamServer)
+		else:
+			address = (self.address, self.port)
+			servers = (ThreadPoolTCPServer, InstrumentedTCPServer)
+
+		if self.__mode == "ThreadPool":
+			self.__server = servers[0](address, self.handler, self.__workers)
+		else:
+			self.__server = servers[1](address, self.handler)
+		self.__server.idleTimeout = self.idleTimeout or None
+		self.__server.requestsStack = self.requestsStack
+		self.__worker = threading.Thread(target=self.__server.serve_forever)
+		self.__worker.setDaemon(True)
+		self.__worker.start()
+		return True
+
+	def stop(self):
+		self.__server.shutdown()
+		self.__server.server_close()
+		self.__server = None
+		self.__worker = None
+		self.transport == "Local" and _removeLocalAddress(_getLocalAddress(self.port))
+		return True
+
+class AsyncoreWaker(asyncore.dispatcher):
+
+	def __init__(self, map):
+		reader, self.__writer = _getSocketPair()
+		self.__writer.setblocking(False)
+		asyncore.dispatcher.__init__(self, reader, map)
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def wake(self):
+		# A full socket buffer means the event loop is already about to wake up.
+		try:
+			self.__writer.send(b"\0")
+		except socket.error:
+			pass
+		return True
+
+	def readable(self):
+		return True
+
+	def writable(self):
+		return False
+
+	def handle_read(self):
+		try:
+			self.socket.recv(4096)
+		except socket.error:
+			pass
+
+	def close(self):
+		asyncore.dispatcher.close(self)
+		self.__writer.close()
+
+class AsyncoreListener(asyncore.dispatcher):
+
+	def __init__(self, address, port, handler, waker, closing, map, server=None, transport="TCP"):
+		asyncore.dispatcher.__init__(self, map=map)
+
+		self.__handler = handler
+		self.__server = server
+		self.__waker = waker
+		self.__closing = closing
+		self.__map = map
+
+		if transport == "Local":
+			address = _getLocalAddress(port)
+			_removeLocalAddress(address)
+			self.create_socket(socket.AF_UNIX, socket.SOCK_STREAM)
+			self.bind(address)
+		else:
+			self.create_socket(socket.AF_INET, socket.SOCK_STREAM)
+			self.bind((address, port))
+		self.listen(InstrumentedTCPServer.request_queue_size)
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def writable(self):
+		return False
+
+	def handle_accept(self):
+		try:
+			pair = self.accept()
+		except socket.error:
+			return
+
+		if pair is None:
+			return
+
+		connection, clientAddress = pair
+		AsyncoreChannel(connection,
+						clientAddress,
+						self.__handler,
+						self.__waker,
+						self.__closing,
+						self.__map,
+						self.__server)
+
+	def handle_error(self):
+		pass
+
+class AsyncoreChannel(asyncore.dispatcher):
+
+	chunkSize = 65536
+
+	def __init__(self, connection, clientAddress, handler, waker, closing, map, server=None):
+		asyncore.dispatcher.__init__(self, connection, map)
+
+		self.__waker = waker
+		self.__closing = closing
+		self.__buffer = bytearray()
+		self.__lock = threading.Lock()
+		self.__finished = False
+		self.__closed = False
+		self.__start = self.__activity = _getTime()
+
+		Runtime.metrics.increment("connectionsAccepted")
+		Runtime.metrics.increment("connectionsActive")
+
+		# The requests handler is created without calling its constructor as it would run the blocking "handle" method,
+		# the received data is fed to the handler instead.
+		if type(handler) is types.ClassType:
+			self.__handler = types.InstanceType(handler)
+		else:
+			self.__handler = handler.__new__(handler)
+		self.__handler.request = self
+		self.__handler.client_address = clientAddress
+		self.__handler.server = server
+		self.__handler.setup()
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def sendall(self, data):
+		# Data can be sent from any thread, it is written by the event loop thread once the socket is writable.
+		with self.__lock:
+			self.__buffer.extend(data)
+		self.__waker.wake()
+		return True
+
+	def readable(self):
+		return not self.__finished
+
+	def writable(self):
+		return bool(self.__buffer)
+
+	def handle_read(self):
+		try:
+			data = self.socket.recv(self.chunkSize)
+		except socket.error as error:
+			if error.errno in (errno.EWOULDBLOCK, errno.EAGAIN):
+				return
+			self.terminate(True)
+			return
+
+		if not data:
+			self.terminate()
+			return
+
+		self.__activity = _getTime()
+		if not self.__handler.feed(data):
+			self.terminate()
+
+	def handle_write(self):
+		with self.__lock:
+			data = bytes(self.__buffer[:self.chunkSize])
+
+		try:
+			sent = self.socket.send(data)
+		except socket.error as error:
+			if error.errno in (errno.EWOULDBLOCK, errno.EAGAIN):
+				return
+			self.terminate(True)
+			return
+
+		self.__activity = _getTime()
+		with self.__lock:
+			del self.__buffer[:sent]
+
+	def handle_close(self):
+		self.terminate(True)
+
+	def handle_error(self):
+		self.terminate(True)
+
+	def terminate(self, disconnected=False):
+		if disconnected:
+			with self.__lock:
+				del self.__buffer[:]
+
+		if self.__finished:
+			return
+
+		self.__finished = True
+		self.__closing.add(self)
+		# A failing handler only loses its own connection, it must not stop the event loop serving the other ones.
+		try:
+			self.__handler.finish()
+		except Exception:
+			traceback.print_exc()
+
+	def expire(self):
+		# The handler is not finished, data received so far is incomplete and discarded.
+		Runtime.metrics.increment("connectionsTimedOut")
+		with self.__lock:
+			del self.__buffer[:]
+		self.__finished = True
+		self.__closing.add(self)
+
+	def isDone(self):
+		# The connection is kept open until the pending requests responses have been written.
+		return self.__finished and not self.__buffer and not getattr(self.__handler, "pending", 0)
+
+	def isIdle(self, timeout):
+		return not self.__finished and \
+				not self.__buffer and \
+				not getattr(self.__handler, "pending", 0) and \
+				_getTime() - self.__activity > timeout
+
+	def close(self):
+		asyncore.dispatcher.close(self)
+		if self.__closed:
+			return
+
+		self.__closed = True
+		Runtime.metrics.increment("connectionsActive", -1)
+		Runtime.metrics.observe("connectionDuration", (_getTime() - self.__start) * 1000.)
+
+class AsyncoreServerEngine(AbstractServerEngine):
+
+	timeout = 0.05
+	# Delay given to the buffered responses to be written once the server is stopped.
+	flushTimeout = 1.
+
+	def __init__(self, address, port, handler, idleTimeout=0, requestsStack=None, transport="TCP"):
+		AbstractServerEngine.__init__(self, address, port, handler, idleTimeout, requestsStack, transport)
+
+		self.__map = {}
+		self.__closing = set()
+		self.__waker = None
+		self.__worker = None
+		self.__running = False
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def start(self):
+		self.__waker = AsyncoreWaker(self.__map)
+		try:
+			AsyncoreListener(self.address,
+							self.port,
+							self.handler,
+							self.__waker,
+							self.__closing,
+							self.__map,
+							self,
+							self.transport)
+		except socket.error:
+			asyncore.close_all(self.__map)
+			raise
+
+		self.__running = True
+		self.__worker = threading.Thread(target=self.__serve)
+		self.__worker.setDaemon(True)
+		self.__worker.start()
+		return True
+
+	def stop(self):
+		self.__running = False
+		self.__waker.wake()
+		self.__worker.join()
+		self.__waker = None
+		self.__worker = None
+		self.transport == "Local" and _removeLocalAddress(_getLocalAddress(self.port))
+		return True
+
+	def __serve(self):
+		usePoll = hasattr(select, "poll")
+		nextIdleCheck = 0
+		while self.__running:
+			try:
+				asyncore.loop(self.timeout, usePoll, self.__map, 1)
+			except Exception:
+				traceback.print_exc()
+			if self.idleTimeout and _getTime() >= nextIdleCheck:
+				for channel in self.__map.values():
+					if isinstance(channel, AsyncoreChannel) and channel.isIdle(self.idleTimeout):
+						channel.expire()
+				nextIdleCheck = _getTime() + min(1., self.idleTimeout / 4.)
+
+			for channel in [channel for channel in self.__closing if channel.isDone()]:
+				self.__closing.discard(channel)
+				channel.close()
+
+		# The responses already buffered, the cancelled requests errors for instance, are written before the remaining
+		# connections are cancelled, later responses are discarded.
+		deadline = _getTime() + self.flushTimeout
+		while _getTime() < deadline and any(channel.writable() for channel in self.__map.values()
+											if isinstance(channel, AsyncoreChannel)):
+			try:
+				asyncore.loop(self.timeout, usePoll, self.__map, 1)
+			except Exception:
+				traceback.print_exc()
+		asyncore.close_all(self.__map)
+		self.__closing.clear()
+
+class NamedPipeConnection(object):
+
+	def __init__(self, handle):
+		self.__handle = handle
+		self.__timeout = None
+		self.__lock = threading.Lock()
+
+		# The pipe is opened for overlapped operations: The requests handler thread reads while responses are written
+		# from other threads, a synchronous pipe handle would serialize them.
+		self.__reading = pywintypes.OVERLAPPED()
+		self.__reading.hEvent = win32event.CreateEvent(None, True, False, None)
+		self.__writing = pywintypes.OVERLAPPED()
+		self.__writing.hEvent = win32event.CreateEvent(None, True, False, None)
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def settimeout(self, value):
+		self.__timeout = value
+
+	def recv(self, size):
+		buffer = win32file.AllocateReadBuffer(size)
+		return bytes(buffer[:self.__read(buffer)])
+
+	def recv_into(self, buffer, size=0):
+		data = self.recv(size or len(buffer))
+		buffer[:len(data)] = data
+		return len(data)
+
+	def sendall(self, data):
+		with self.__lock:
+			offset = 0
+			while offset < len(data):
+				try:
+					win32file.WriteFile(self.__handle, data[offset:], self.__writing)
+					offset += win32file.GetOverlappedResult(self.__handle, self.__writing, True)
+				except pywintypes.error as error:
+					raise socket.error(error.winerror, error.strerror)
+		return True
+
+	def close(self):
+		# The client can still read the written data once the server end of the pipe is closed.
+		self.__handle.Close()
+
+	def __read(self, buffer):
+		try:
+			win32file.ReadFile(self.__handle, buffer, self.__reading)
+			timeout = win32event.INFINITE if self.__timeout is None else int(self.__timeout * 1000)
+			if win32event.WaitForSingleObject(self.__reading.hEvent, timeout) == win32event.WAIT_TIMEOUT:
+				win32file.CancelIo(self.__handle)
+				try:
+					# The read might have completed while being cancelled.
+					return win32file.GetOverlappedResult(self.__handle, self.__reading, True)
+				except pywintypes.error:
+					raise socket.timeout("timed out")
+			return win32file.GetOverlappedResult(self.__handle, self.__reading, True)
+		except pywintypes.error as error:
+			if error.winerror in (winerror.ERROR_BROKEN_PIPE, winerror.ERROR_PIPE_NOT_CONNECTED):
+				return 0
+			raise socket.error(error.winerror, error.strerror)
+
+class NamedPipeServerEngine(AbstractServerEngine):
+
+	bufferSize = 65536
+	firstPipeInstanceFlag = 0x00080000
+
+	def __init__(self,
+				address,
+				port,
+				handler,
+				mode="Single",
+				workers=None,
+				idleTimeout=0,
+				requestsStack=None,
+				transport="Local"):
+		AbstractServerEngine.__init__(self, address, port, handler, idleTimeout, requestsStack, transport)
+
+		self.__mode = mode
+		self.__workersCount = workers or ThreadPoolTCPServer.workers
+
+		self.__stopping = None
+		self.__workers = []
+
+	#******************************************************************************************************************
+	#***	Attributes properties.
+	#******************************************************************************************************************
+	@property
+	def connections(self):
+		return self.__workersCount if self.__mode == "ThreadPool" else 1
+
+	@connections.setter
+	def connections(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "connections"))
+
+	@connections.deleter
+	def connections(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "connections"))
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def start(self):
+		if win32pipe is None:
+			raise ServerOperationError("{0} | 'pywin32' package is required by the named pipes transport!".format(
+			self.__class__.__name__))
+
+		# Each worker serves its own pipe instance, the first instance creation fails if another server already owns
+		# the pipe name.
+		try:
+			handles = [self.__createPipe(i == 0)
+						for i in range(self.__workersCount if self.__mode == "ThreadPool" else 1)]
+		except pywintypes.error as error:
+			raise socket.error(errno.EADDRINUSE, error.strerror)
+
+		self.__stopping = win32event.CreateEvent(None, True, False, None)
+		for handle in handles:
+			worker = threading.Thread(target=self.__serve, args=(handle,))
+			worker.setDaemon(True)
+			worker.start()
+			self.__workers.append(worker)
+		return True
+
+	def stop(self):
+		win32event.SetEvent(self.__stopping)
+		for worker in self.__workers:
+			worker.join()
+		self.__workers = []
+		self.__stopping = None
+		return True
+
+	def __createPipe(self, first=False):
+		return win32pipe.CreateNamedPipe(_getLocalAddress(self.port),
+										win32pipe.PIPE_ACCESS_DUPLEX |
+										win32file.FILE_FLAG_OVERLAPPED |
+										(self.firstPipeInstanceFlag if first else 0),
+										win32pipe.PIPE_TYPE_BYTE | win32pipe.PIPE_READMODE_BYTE | win32pipe.PIPE_WAIT,
+										win32pipe.PIPE_UNLIMITED_INSTANCES,
+										self.bufferSize,
+										self.bufferSize,
+										0,
+										None)
+
+	def __serve(self, handle):
+		connecting = pywintypes.OVERLAPPED()
+		connecting.hEvent = win32event.CreateEvent(None, True, False, None)
+		while True:
+			if win32pipe.ConnectNamedPipe(handle, connecting) == winerror.ERROR_IO_PENDING:
+				if win32event.WaitForMultipleObjects((connecting.hEvent, self.__stopping),
+													False,
+													win32event.INFINITE) != win32event.WAIT_OBJECT_0:
+					win32file.CancelIo(handle)
+					handle.Close()
+					break
+
+			self.__finishRequest(NamedPipeConnection(handle))
+			if win32event.WaitForSingleObject(self.__stopping, 0) == win32event.WAIT_OBJECT_0:
+				break
+
+			handle = self.__createPipe()
+
+	def __finishRequest(self, connection):
+		Runtime.metrics.increment("connectionsAccepted")
+		Runtime.metrics.increment("connectionsActive")
+		connection.settimeout(self.idleTimeout or None)
+		start = _getTime()
+		try:
+			self.handler(connection, _getLocalAddress(self.port), self)
+		except socket.timeout:
+			Runtime.metrics.increment("connectionsTimedOut")
+		except Exception:
+			traceback.print_exc()
+		finally:
+			connection.close()
+			Runtime.metrics.increment("connectionsActive", -1)
+			Runtime.metrics.observe("connectionDuration", (_getTime() - start) * 1000.)
+
+class Request(object):
+
+	__slots__ = ("data",
+				"identifier",
+				"flags",
+				"connection",
+				"timestamp",
+				"key",
+				"priority",
+				"superseded",
+				"duplicates",
+				"sharedBuffer")
+
+	def __init__(self,
+				data,
+				identifier=0,
+				flags=0,
+				connection=None,
+				timestamp=None,
+				key=None,
+				priority=1,
+				sharedBuffer=None):
+		self.data = data
+		self.identifier = identifier
+		self.flags = flags
+		self.connection = connection
+		self.timestamp = _getTime() if timestamp is None else timestamp
+		self.key = key
+		self.priority = priority
+		self.superseded = False
+		self.duplicates = None
+		self.sharedBuffer = sharedBuffer
+
+class RequestsQueue(object):
+
+	policies = ("Block", "Reject", "DropOldest")
+	priorities = ("High", "Normal", "Low")
+
+	def __init__(self, capacity=0, policy="Block", deduplicationWindow=0, starvationTimeout=0):
+		self.__capacity = None
+		self.capacity = capacity
+		self.__policy = None
+		self.policy = policy
+		self.__deduplicationWindow = None
+		self.deduplicationWindow = deduplicationWindow
+		self.__starvationTimeout = None
+		self.starvationTimeout = starvationTimeout
+
+		self.__lanes = [collections.deque() for priority in self.priorities]
+		self.__condition = threading.Condition()
+		self.__depth = 0
+		self.__keys = {}
+		self.__pending = {}
+
+		self.__highWaterMark = 0
+		self.__rejected = 0
+		self.__dropped = 0
+		self.__superseded = 0
+		self.__collapsed = 0
+
+	#******************************************************************************************************************
+	#***	Attributes properties.
+	#******************************************************************************************************************
+	@property
+	def capacity(self):
+		return self.__capacity
+
+	@capacity.setter
+	def capacity(self, value):
+		if value is not None:
+			assert type(value) is int, "'{0}' attribute: '{1}' type is not 'int'!".format(
+			"capacity", value)
+			assert value >= 0, "'{0}' attribute: '{1}' need to be positive!".format("capacity", value)
+		self.__capacity = value
+
+	@capacity.deleter
+	def capacity(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "capacity"))
+
+	@property
+	def policy(self):
+		return self.__policy
+
+	@policy.setter
+	def policy(self, value):
+		if value is not None:
+			assert value in self.policies, "'{0}' attribute: '{1}' is not in '{2}' policies!".format(
+			"policy", value, self.policies)
+		self.__policy = value
+
+	@policy.deleter
+	def policy(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "policy"))
+
+	@property
+	def deduplicationWindow(self):
+		return self.__deduplicationWindow
+
+	@deduplicationWindow.setter
+	def deduplicationWindow(self, value):
+		if value is not None:
+			assert type(value) is int, "'{0}' attribute: '{1}' type is not 'int'!".format(
+			"deduplicationWindow", value)
+			assert value >= 0, "'{0}' attribute: '{1}' need to be positive!".format("deduplicationWindow", value)
+		self.__deduplicationWindow = value
+
+	@deduplicationWindow.deleter
+	def deduplicationWindow(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(
+		self.__class__.__name__, "deduplicationWindow"))
+
+	@property
+	def starvationTimeout(self):
+		return self.__starvationTimeout
+
+	@starvationTimeout.setter
+	def starvationTimeout(self, value):
+		if value is not None:
+			assert type(value) is int, "'{0}' attribute: '{1}' type is not 'int'!".format(
+			"starvationTimeout", value)
+			assert value >= 0, "'{0}' attribute: '{1}' need to be positive!".format("starvationTimeout", value)
+		self.__starvationTimeout = value
+
+	@starvationTimeout.deleter
+	def starvationTimeout(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(
+		self.__class__.__name__, "starvationTimeout"))
+
+	@property
+	def statistics(self):
+		with self.__condition:
+			lanes = dict((priority, sum(1 for request in lane if not request.superseded))
+						for priority, lane in zip(self.priorities, self.__lanes))
+		return {"depth": self.__depth,
+				"lanes": lanes,
+				"highWaterMark": self.__highWaterMark,
+				"rejected": self.__rejected,
+				"dropped": self.__dropped,
+				"superseded": self.__superseded,
+				"collapsed": self.__collapsed}
+
+	@statistics.setter
+	def statistics(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "statistics"))
+
+	@statistics.deleter
+	def statistics(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "statistics"))
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def __len__(self):
+		return self.__depth
+
+	def __nonzero__(self):
+		return bool(self.__depth)
+
+	def __iter__(self):
+		with self.__condition:
+			return iter([request for request in itertools.chain(*self.__lanes) if not request.superseded])
+
+	def append(self, request):
+		dropped = superseded = None
+		with self.__condition:
+			if request.key is not None:
+				# A keyed request replaces the pending one with the same key, which is skipped once dequeued.
+				superseded = self.__keys.get(request.key)
+				if superseded is not None:
+					superseded.superseded = True
+					self.__depth -= 1
+					self.__superseded += 1
+			elif self.__deduplicationWindow and self.__isCollapsible(request):
+				# An exact duplicate of a recent pending request is answered along with it instead of executed again.
+				original = self.__pending.get((request.data, request.flags))
+				if original is not None and \
+				request.timestamp - original.timestamp <= self.__deduplicationWindow / 1000.:
+					if original.duplicates is None:
+						original.duplicates = []
+					original.duplicates.append(request)
+					self.__collapsed += 1
+					return True
+
+			if self.__capacity and self.__depth >= self.__capacity:
+				if self.__policy == "Block":
+					# The server thread stops reading from its socket, pushing back on the client.
+					while self.__depth >= self.__capacity:
+						self.__condition.wait()
+				elif self.__policy == "Reject":
+					self.__rejected += 1
+					self.__overload(request, "Requests queue is full, request rejected!")
+					return False
+				elif self.__policy == "DropOldest":
+					dropped = self.__drop()
+					self.__dropped += 1
+
+			self.__lanes[request.priority].append(request)
+			self.__depth += 1
+			self.__highWaterMark = max(self.__highWaterMark, self.__depth)
+			if request.key is not None:
+				self.__keys[request.key] = request
+			elif self.__deduplicationWindow and self.__isCollapsible(request):
+				self.__pending[(request.data, request.flags)] = request
+
+			# Superseded requests are discarded in bulk when they outnumber the pending ones.
+			if sum(len(lane) for lane in self.__lanes) > 2 * self.__depth + 1024:
+				self.__lanes = [collections.deque(request for request in lane if not request.superseded)
+								for lane in self.__lanes]
+
+		superseded and superseded.connection and superseded.connection.respond(superseded, {"value": None,
+																							"error": None,
+																							"superseded": True})
+		dropped and self.__overload(dropped, "Requests queue is full, request dropped!")
+		return True
+
+	def popleft(self):
+		with self.__condition:
+			request = self.__pop()
+			self.__condition.notify()
+		return request
+
+	def clear(self):
+		with self.__condition:
+			for lane in self.__lanes:
+				lane.clear()
+			self.__depth = 0
+			self.__keys.clear()
+			self.__pending.clear()
+			self.__condition.notify_all()
+		return True
+
+	def drain(self, error):
+		# The pending requests are answered with given error instead of leaving their clients waiting for them.
+		with self.__condition:
+			requests = [request for request in itertools.chain(*self.__lanes) if not request.superseded]
+		self.clear()
+		for request in requests:
+			self.__overload(request, error)
+		return len(requests)
+
+	def reset(self):
+		self.__highWaterMark = self.__depth
+		self.__rejected = 0
+		self.__dropped = 0
+		self.__superseded = 0
+		self.__collapsed = 0
+		return True
+
+	def __pop(self):
+		# Lanes are served by priority, unless a lower priority lane oldest request has been waiting longer than the
+		# starvation timeout in excess of the request that would be served: The lane with the oldest starving request
+		# is then served first. Comparing the waiting times keeps the priorities when every lane lags behind under
+		# overload, the queue would be served oldest first otherwise.
+		selected = starving = None
+		for lane in self.__lanes:
+			while lane and lane[0].superseded:
+				lane.popleft()
+			if not lane:
+				continue
+
+			if selected is None:
+				selected = lane
+			elif self.__starvationTimeout and \
+			(selected[0].timestamp - lane[0].timestamp) * 1000. > self.__starvationTimeout:
+				if starving is None or lane[0].timestamp < starving[0].timestamp:
+					starving = lane
+		if selected is None:
+			return None
+
+		return self.__forget((starving or selected).popleft())
+
+	def __drop(self):
+		for lane in reversed(self.__lanes):
+			while lane and lane[0].superseded:
+				lane.popleft()
+			if lane:
+				return self.__forget(lane.popleft())
+
+	def __forget(self, request):
+		self.__depth -= 1
+		if request.key is not None:
+			self.__keys.get(request.key) is request and self.__keys.pop(request.key)
+		elif self.__pending.get((request.data, request.flags)) is request:
+			del self.__pending[(request.data, request.flags)]
+		return request
+
+	def __overload(self, request, error):
+		for request in itertools.chain((request,), request.duplicates or ()):
+			request.connection and request.connection.respond(request, {"value": None, "error": error})
+
+	@staticmethod
+	def __isCollapsible(request):
+		# Shared buffers contents and streamed blocks, which are parts of a larger request, differ from one request
+		# to the other whatever their code.
+		return request.sharedBuffer is None and type(request.data) is not types.CodeType
+
+class BatchScope(object):
+
+	# Preferences slowing down each executed command, they stay suspended while batches follow each other and are
+	# released once a tick executes no batch. Their original values are journaled first so that a session ending
+	# while they are suspended gets them back on next startup.
+	preferences = (("scripting.cmdlog", False), ("Interaction.autoinspect", False))
+
+	def __init__(self, name="TCPServer Requests", journal=None):
+		self.__name = None
+		self.name = name
+		self.__journal = None
+		self.journal = journal
+
+		self.__opened = False
+		self.__undo = False
+		self.__restore = []
+
+	#******************************************************************************************************************
+	#***	Attributes properties.
+	#******************************************************************************************************************
+	@property
+	def name(self):
+		return self.__name
+
+	@name.setter
+	def name(self, value):
+		assert type(value) in (str, unicode), "'{0}' attribute: '{1}' type is not 'str' or 'unicode'!".format(
+		"name", value)
+		self.__name = value
+
+	@name.deleter
+	def name(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "name"))
+
+	@property
+	def journal(self):
+		return self.__journal
+
+	@journal.setter
+	def journal(self, value):
+		if value is not None:
+			assert type(value) in (str, unicode), "'{0}' attribute: '{1}' type is not 'str' or 'unicode'!".format(
+			"journal", value)
+		self.__journal = value
+
+	@journal.deleter
+	def journal(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "journal"))
+
+	@property
+	def opened(self):
+		return self.__opened
+
+	@opened.setter
+	def opened(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "opened"))
+
+	@opened.deleter
+	def opened(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "opened"))
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def __enter__(self):
+		self.open()
+		return self
+
+	def __exit__(self, *arguments):
+		self.close()
+
+	def open(self):
+		if self.__opened:
+			return False
+
+		self.__restore or self.suspend()
+
+		try:
+			Application.BeginUndo(self.__name)
+			self.__undo = True
+		except Exception:
+			self.__undo = False
+
+		self.__opened = True
+		return True
+
+	def close(self):
+		if not self.__opened:
+			return False
+
+		if self.__undo:
+			try:
+				Application.EndUndo()
+			except Exception:
+				pass
+
+		# The requests of a tick are executed within a single timer event, the viewports are not redrawn before the
+		# application gets idle again: They are refreshed once for the whole batch.
+		try:
+			Application.Refresh()
+		except Exception:
+			pass
+
+		self.__opened = False
+		return True
+
+	def suspend(self):
+		# Application features missing from the running session, batch sessions for instance, are skipped.
+		changes = []
+		for name, value in self.preferences:
+			try:
+				previous = Application.preferences.GetPreferenceValue(name)
+			except Exception:
+				continue
+
+			if previous != value:
+				changes.append((name, value, previous))
+		if not changes:
+			return False
+
+		# The preferences are left untouched when their original values cannot be journaled.
+		if self.__journal:
+			try:
+				with open(self.__journal, "w") as file:
+					json.dump([(name, previous) for name, value, previous in changes], file)
+			except (IOError, OSError, TypeError, ValueError):
+				return False
+
+		for name, value, previous in changes:
+			try:
+				Application.preferences.SetPreferenceValue(name, value)
+				self.__restore.append((name, previous))
+			except Exception:
+				continue
+		return True
+
+	def release(self):
+		if not self.__restore:
+			return False
+
+		for name, value in reversed(self.__restore):
+			try:
+				Application.preferences.SetPreferenceValue(name, value)
+			except Exception:
+				pass
+		self.__restore = []
+		self.__removeJournal()
+		return True
+
+	def recover(self):
+		# Preferences journaled by a session that ended while they were suspended are restored.
+		if not self.__journal or not os.path.exists(self.__journal):
+			return False
+
+		try:
+			with open(self.__journal) as file:
+				self.__restore = [tuple(item) for item in json.load(file)]
+		except (IOError, OSError, TypeError, ValueError):
+			self.__restore = []
+		return self.release() or self.__removeJournal()
+
+	def __removeJournal(self):
+		try:
+			self.__journal and os.path.exists(self.__journal) and os.remove(self.__journal)
+		except OSError:
+			pass
+		return False
+
+class TimerScheduler(object):
+
+	def __init__(self,
+				minimumInterval=10,
+				maximumInterval=30,
+				backoff=2.0,
+				timeBudget=50,
+				itemsBudget=0,
+				batchExecution=False):
+		self.__minimumInterval = None
+		self.minimumInterval = minimumInterval
+		self.__maximumInterval = None
+		self.maximumInterval = maximumInterval
+		self.__backoff = None
+		self.backoff = backoff
+		self.__timeBudget = None
+		self.timeBudget = timeBudget
+		self.__itemsBudget = None
+		self.itemsBudget = itemsBudget
+		self.__batchExecution = None
+		self.batchExecution = batchExecution
+
+		self.__interval = minimumInterval
+		self.__signal = threading.Event()
+		self.__processed = 0
+		self.__maximumProcessed = 0
+		self.__backlog = 0
+		self.__cursor = 0
+		self.__batchScope = BatchScope()
+
+		self.__requests = 0
+		self.__latency = 0.
+		self.__maximumLatency = 0.
+
+	#******************************************************************************************************************
+	#***	Attributes properties.
+	#******************************************************************************************************************
+	@property
+	def minimumInterval(self):
+		return self.__minimumInterval
+
+	@minimumInterval.setter
+	def minimumInterval(self, value):
+		if value is not None:
+			assert type(value) is int, "'{0}' attribute: '{1}' type is not 'int'!".format(
+			"minimumInterval", value)
+			assert value > 0, "'{0}' attribute: '{1}' need to be exactly positive!".format("minimumInterval", value)
+		self.__minimumInterval = value
+
+	@minimumInterval.deleter
+	def minimumInterval(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(
+		self.__class__.__name__, "minimumInterval"))
+
+	@property
+	def maximumInterval(self):
+		return self.__maximumInterval
+
+	@maximumInterval.setter
+	def maximumInterval(self, value):
+		if value is not None:
+			assert type(value) is int, "'{0}' attribute: '{1}' type is not 'int'!".format(
+			"maximumInterval", value)
+			assert value > 0, "'{0}' attribute: '{1}' need to be exactly positive!".format("maximumInterval", value)
+		self.__maximumInterval = value
+
+	@maximumInterval.deleter
+	def maximumInterval(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(
+		self.__class__.__name__, "maximumInterval"))
+
+	@property
+	def backoff(self):
+		return self.__backoff
+
+	@backoff.setter
+	def backoff(self, value):
+		if value is not None:
+			assert type(value) is float, "'{0}' attribute: '{1}' type is not 'float'!".format(
+			"backoff", value)
+			assert value >= 1., "'{0}' attribute: '{1}' need to be greater or equal to '1.0'!".format(
+			"backoff", value)
+		self.__backoff = value
+
+	@backoff.deleter
+	def backoff(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "backoff"))
+
+	@property
+	def timeBudget(self):
+		return self.__timeBudget
+
+	@timeBudget.setter
+	def timeBudget(self, value):
+		if value is not None:
+			assert type(value) is int, "'{0}' attribute: '{1}' type is not 'int'!".format(
+			"timeBudget", value)
+			assert value >= 0, "'{0}' attribute: '{1}' need to be positive!".format("timeBudget", value)
+		self.__timeBudget = value
+
+	@timeBudget.deleter
+	def timeBudget(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "timeBudget"))
+
+	@property
+	def itemsBudget(self):
+		return self.__itemsBudget
+
+	@itemsBudget.setter
+	def itemsBudget(self, value):
+		if value is not None:
+			assert type(value) is int, "'{0}' attribute: '{1}' type is not 'int'!".format(
+			"itemsBudget", value)
+			assert value >= 0, "'{0}' attribute: '{1}' need to be positive!".format("itemsBudget", value)
+		self.__itemsBudget = value
+
+	@itemsBudget.deleter
+	def itemsBudget(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "itemsBudget"))
+
+	@property
+	def batchExecution(self):
+		return self.__batchExecution
+
+	@batchExecution.setter
+	def batchExecution(self, value):
+		if value is not None:
+			assert type(value) is bool, "'{0}' attribute: '{1}' type is not 'bool'!".format("batchExecution", value)
+		self.__batchExecution = value
+
+	@batchExecution.deleter
+	def batchExecution(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(
+		self.__class__.__name__, "batchExecution"))
+
+	@property
+	def batchScope(self):
+		return self.__batchScope
+
+	@batchScope.setter
+	def batchScope(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "batchScope"))
+
+	@batchScope.deleter
+	def batchScope(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "batchScope"))
+
+	@property
+	def interval(self):
+		return self.__interval
+
+	@interval.setter
+	def interval(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "interval"))
+
+	@interval.deleter
+	def interval(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "interval"))
+
+	@property
+	def latency(self):
+		return {"requests": self.__requests,
+				"average": self.__latency / self.__requests if self.__requests else 0.,
+				"maximum": self.__maximumLatency}
+
+	@latency.setter
+	def latency(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "latency"))
+
+	@latency.deleter
+	def latency(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "latency"))
+
+	@property
+	def throughput(self):
+		return {"processed": self.__processed,
+				"maximum": self.__maximumProcessed,
+				"backlog": self.__backlog}
+
+	@throughput.setter
+	def throughput(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "throughput"))
+
+	@throughput.deleter
+	def throughput(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "throughput"))
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def signal(self):
+		# Called from the server threads: Softimage timers cannot be re-armed outside the main thread, the signal is
+		# consumed on next tick and keeps the dispatcher on the minimum interval. It cannot shorten the pending tick,
+		# the idle latency is bounded by the maximum interval instead.
+		self.__signal.set()
+
+	def addLatency(self, request):
+		latency = (_getTime() - request.timestamp) * 1000.
+		Runtime.metrics.observe("timeInQueue", latency)
+		self.__requests += 1
+		self.__latency += latency
+		self.__maximumLatency = max(self.__maximumLatency, latency)
+		return latency
+
+	def process(self, requestsStack, processor):
+		return self.dispatch(((requestsStack, processor, 0),))
+
+	def dispatch(self, sources):
+		# At least one request is processed per tick, leftovers are carried over to the next ticks so that bursts do
+		# not freeze the application.
+		# Sources are given as ( Requests queue, processor, items budget ) tuples and drained in turn one request at
+		# a time, the first source served rotating from one tick to the next.
+		# Requests drained in a tick share a single batch scope when the batch execution is enabled or when they are
+		# flagged by the client, the scope is closed at the end of the tick whatever happens.
+		deadline = _getTime() + self.__timeBudget / 1000.
+		processed = 0
+		batched = False
+		counts = [0] * len(sources)
+		self.__cursor = (self.__cursor + 1) % (len(sources) or 1)
+		active = [(self.__cursor + i) % len(sources) for i in range(len(sources))]
+		try:
+			while active:
+				for index in list(active):
+					requestsStack, processor, itemsBudget = sources[index]
+					if not requestsStack or itemsBudget and counts[index] >= itemsBudget:
+						active.remove(index)
+						continue
+
+					if self.__itemsBudget and processed >= self.__itemsBudget or \
+					self.__timeBudget and processed and _getTime() >= deadline:
+						active = []
+						break
+
+					request = requestsStack.popleft()
+					if not self.__batchScope.opened and \
+					(self.__batchExecution or request.flags & FramedStackDataRequestsHandler.batchFlag):
+						self.__batchScope.open()
+						Runtime.metrics.increment("batches")
+						batched = True
+
+					start = _getTime()
+					processor(request)
+					Runtime.metrics.observe("executionTime", (_getTime() - start) * 1000.)
+					counts[index] += 1
+					processed += 1
+		finally:
+			self.__batchScope.close()
+			batched or self.__batchScope.release()
+
+		self.__processed = processed
+		self.__maximumProcessed = max(self.__maximumProcessed, processed)
+		self.__backlog = sum(len(source[0]) for source in sources)
+		Runtime.metrics.increment("requestsProcessed", processed)
+		Runtime.metrics.gauge("queueDepth", self.__backlog)
+		if self.__backlog:
+			Application.LogMessage("{0} | '{1}' requests processed, '{2}' requests carried over to next tick.".format(
+			Constants.name, processed, self.__backlog), siConstants.siVerbose)
+		return processed
+
+	def schedule(self, pending=False):
+		if pending or self.__processed or self.__signal.is_set():
+			self.__signal.clear()
+			interval = self.__minimumInterval
+		else:
+			interval = min(max(int(self.__interval * self.__backoff), self.__minimumInterval), self.__maximumInterval)
+
+		self.__interval = interval
+		return interval
+
+	def reset(self):
+		self.__requests = 0
+		self.__latency = 0.
+		self.__maximumLatency = 0.
+		self.__maximumProcessed = 0
+		self.__batchScope.release()
+		return True
+
+class ResponsesWriter(object):
+
+	def __init__(self):
+		# Closed connections are kept with a "None" queue until they are collected.
+		self.__responses = weakref.WeakKeyDictionary()
+		self.__lock = threading.Lock()
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def post(self, connection, data):
+		# "Asyncore" channels only buffer the data for their event loop, it is written inline.
+		if isinstance(connection.request, AsyncoreChannel):
+			return connection.send(data)
+
+		# Responses are written by a persistent thread per connection so that a slow client neither blocks the main
+		# thread nor the other clients responses, the thread exits once the connection is closed.
+		with self.__lock:
+			if connection not in self.__responses:
+				self.__responses[connection] = Queue.Queue()
+				worker = threading.Thread(target=self.__write, args=(connection, self.__responses[connection]))
+				worker.setDaemon(True)
+				worker.start()
+			responses = self.__responses[connection]
+
+		if responses is None:
+			return connection.send(data)
+
+		responses.put(data)
+		return True
+
+	def close(self, connection):
+		with self.__lock:
+			responses = self.__responses.get(connection)
+			self.__responses[connection] = None
+
+		# The writer exits once the responses queued before the connection was closed have been written.
+		if responses is not None:
+			responses.put(None)
+		return True
+
+	def __write(self, connection, responses):
+		while True:
+			data = responses.get()
+			if data is None:
+				return
+
+			# The thread must not die with responses left in its queue, they would never be written.
+			try:
+				connection.send(data)
+			except Exception:
+				traceback.print_exc()
+
+class WorkersPool(object):
+
+	def __init__(self, workers=4):
+		self.__tasks = Queue.Queue()
+		self.__lock = threading.Lock()
+		self.__threads = 0
+		self.__active = 0
+		self.__processed = 0
+
+		self.__workers = None
+		self.workers = workers
+
+	#******************************************************************************************************************
+	#***	Attributes properties.
+	#******************************************************************************************************************
+	@property
+	def workers(self):
+		return self.__workers
+
+	@workers.setter
+	def workers(self, value):
+		assert type(value) is int, "'{0}' attribute: '{1}' type is not 'int'!".format("workers", value)
+		assert value > 0, "'{0}' attribute: '{1}' need to be exactly positive!".format("workers", value)
+		self.__workers = value
+		# Surplus threads exit once their current task is done.
+		if self.__threads > value:
+			with self.__lock:
+				for i in range(self.__threads - value):
+					self.__tasks.put(None)
+				self.__threads = value
+
+	@workers.deleter
+	def workers(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "workers"))
+
+	@property
+	def statistics(self):
+		return {"workers": self.__threads,
+				"pending": self.__tasks.qsize(),
+				"active": self.__active,
+				"processed": self.__processed}
+
+	@statistics.setter
+	def statistics(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "statistics"))
+
+	@statistics.deleter
+	def statistics(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "statistics"))
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def submit(self, function, *arguments):
+		# Threads are started on first use so that an unused pool costs nothing.
+		if self.__threads < self.__workers:
+			with self.__lock:
+				while self.__threads < self.__workers:
+					thread = threading.Thread(target=self.__work)
+					thread.setDaemon(True)
+					thread.start()
+					self.__threads += 1
+
+		self.__tasks.put((function, arguments))
+		return True
+
+	def stop(self):
+		with self.__lock:
+			for i in range(self.__threads):
+				self.__tasks.put(None)
+			self.__threads = 0
+		return True
+
+	def __work(self):
+		while True:
+			task = self.__tasks.get()
+			if task is None:
+				return
+
+			function, arguments = task
+			with self.__lock:
+				self.__active += 1
+			try:
+				function(*arguments)
+			except Exception:
+				traceback.print_exc()
+			finally:
+				with self.__lock:
+					self.__active -= 1
+					self.__processed += 1
+
+class LRUCache(object):
+
+	def __init__(self, capacity=256):
+		self.__capacity = None
+		self.capacity = capacity
+
+		self.__entries = collections.OrderedDict()
+		self.__size = 0
+		self.__hits = 0
+		self.__misses = 0
+
+	#******************************************************************************************************************
+	#***	Attributes properties.
+	#******************************************************************************************************************
+	@property
+	def capacity(self):
+		return self.__capacity
+
+	@capacity.setter
+	def capacity(self, value):
+		if value is not None:
+			assert type(value) is int, "'{0}' attribute: '{1}' type is not 'int'!".format(
+			"capacity", value)
+			assert value > 0, "'{0}' attribute: '{1}' need to be exactly positive!".format("capacity", value)
+		self.__capacity = value
+
+	@capacity.deleter
+	def capacity(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "capacity"))
+
+	@property
+	def statistics(self):
+		return {"entries": len(self.__entries),
+				"size": self.__size,
+				"hits": self.__hits,
+				"misses": self.__misses}
+
+	@statistics.setter
+	def statistics(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "statistics"))
+
+	@statistics.deleter
+	def statistics(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "statistics"))
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def __len__(self):
+		return len(self.__entries)
+
+	def __contains__(self, key):
+		return key in self.__entries
+
+	def get(self, key, default=None):
+		entry = self.__entries.pop(key, None)
+		if entry is None:
+			self.__misses += 1
+			return default
+
+		self.__hits += 1
+		self.__entries[key] = entry
+		return entry[0]
+
+	def set(self, key, value, size=1):
+		# The capacity is expressed in the unit of the entries size: entries count by default, bytes for instance.
+		entry = self.__entries.pop(key, None)
+		if entry is not None:
+			self.__size -= entry[1]
+
+		self.__entries[key] = (value, size)
+		self.__size += size
+		while self.__size > self.__capacity and len(self.__entries) > 1:
+			self.__size -= self.__entries.popitem(last=False)[1][1]
+		return True
+
+	def clear(self):
+		self.__entries.clear()
+		self.__size = 0
+		return True
+
+	def reset(self):
+		self.__hits = 0
+		self.__misses = 0
+		return True
+
+class MappedBuffer(object):
+
+	def __init__(self, descriptor):
+		self.__descriptor = descriptor
+		self.__mapping = None
+		self.__buffer = None
+
+	#******************************************************************************************************************
+	#***	Attributes properties.
+	#******************************************************************************************************************
+	@property
+	def descriptor(self):
+		return self.__descriptor
+
+	@descriptor.setter
+	def descriptor(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "descriptor"))
+
+	@descriptor.deleter
+	def descriptor(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "descriptor"))
+
+	@property
+	def buffer(self):
+		return self.__buffer
+
+	@buffer.setter
+	def buffer(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "buffer"))
+
+	@buffer.deleter
+	def buffer(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "buffer"))
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def __enter__(self):
+		self.open()
+		return self.__buffer
+
+	def __exit__(self, *arguments):
+		self.close()
+
+	def open(self):
+		# The mapping offset needs to be aligned on the allocation granularity, the buffer starts at the requested one.
+		size = int(self.__descriptor["size"])
+		offset = int(self.__descriptor.get("offset", 0))
+		alignedOffset = offset - offset % mmap.ALLOCATIONGRANULARITY
+		if "name" in self.__descriptor:
+			# Windows named shared memory created by the client.
+			self.__mapping = mmap.mmap(-1,
+									offset + size,
+									tagname=self.__descriptor["name"],
+									access=mmap.ACCESS_READ)
+			alignedOffset = 0
+		else:
+			with open(self.__descriptor["path"], "rb") as file:
+				self.__mapping = mmap.mmap(file.fileno(),
+										offset - alignedOffset + size,
+										access=mmap.ACCESS_READ,
+										offset=alignedOffset)
+		self.__buffer = buffer(self.__mapping, offset - alignedOffset, size)
+		Runtime.metrics.increment("bytesMapped", size)
+		return True
+
+	def close(self):
+		# A buffer kept by the executed code raises an exception once the mapping is closed.
+		self.__buffer = None
+		if self.__mapping is not None:
+			self.__mapping.close()
+			self.__mapping = None
+		return True
+
+class PythonExecutor(object):
+
+	applicationGlobals = ("Application", "XSIUtils", "XSIFactory", "XSIMath", "XSIUIToolkit")
+
+	def __init__(self, cache=None):
+		self.__cache = cache or LRUCache()
+		self.__namespace = None
+		self.__lock = threading.Lock()
+
+	#******************************************************************************************************************
+	#***	Attributes properties.
+	#******************************************************************************************************************
+	@property
+	def cache(self):
+		return self.__cache
+
+	@cache.setter
+	def cache(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "cache"))
+
+	@cache.deleter
+	def cache(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "cache"))
+
+	@property
+	def namespace(self):
+		if self.__namespace is None:
+			self.__namespace = self.getNamespace("__{0}__".format(Constants.name))
+		return self.__namespace
+
+	@namespace.setter
+	def namespace(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "namespace"))
+
+	@namespace.deleter
+	def namespace(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "namespace"))
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	@staticmethod
+	def getDigest(source):
+		return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+	def getNamespace(self, name):
+		namespace = {"__name__": name, "siConstants": siConstants}
+		for attribute in self.applicationGlobals:
+			if attribute in globals():
+				namespace[attribute] = globals()[attribute]
+		return namespace
+
+	def compile(self, source):
+		digest = self.getDigest(source)
+		with self.__lock:
+			code = self.__cache.get(digest)
+		if code is None:
+			# Single expressions are evaluated so that their value can be returned to the client.
+			try:
+				code = compile(source, "<{0} | {1}>".format(Constants.name, digest), "eval", dont_inherit=True)
+			except SyntaxError:
+				code = compile(source, "<{0} | {1}>".format(Constants.name, digest), "exec", dont_inherit=True)
+			with self.__lock:
+				self.__cache.set(digest, code)
+		return digest, code
+
+	def execute(self, source, variables=None):
+		digest, code = self.compile(source)
+		return digest, self.evaluate(code, variables)
+
+	def executeCached(self, digest, variables=None):
+		with self.__lock:
+			code = self.__cache.get(digest)
+		if code is None:
+			raise CacheMissError("{0} | '{1}' digest is not cached!".format(self.__class__.__name__, digest))
+
+		return digest, self.evaluate(code, variables)
+
+	def evaluate(self, code, variables=None):
+		if not variables:
+			return eval(code, self.namespace)
+
+		# Given variables are only bound for the execution, the persistent namespace values they shadow are restored.
+		namespace = self.namespace
+		shadowed = dict((name, namespace[name]) for name in variables if name in namespace)
+		namespace.update(variables)
+		try:
+			return eval(code, namespace)
+		finally:
+			for name in variables:
+				namespace.pop(name, None)
+			namespace.update(shadowed)
+
+	def executeScript(self, code, path):
+		# Scripts run in their own namespace as they would with "Application.ExecuteScript", their directory being
+		# searched first by their imports.
+		namespace = self.getNamespace("__main__")
+		namespace["__file__"] = path
+		directory = os.path.dirname(os.path.abspath(path))
+		sys.path.insert(0, directory)
+		try:
+			return eval(code, namespace)
+		finally:
+			directory in sys.path and sys.path.remove(directory)
+
+class BackgroundPythonExecutor(PythonExecutor):
+
+	# Background requests are executed off the main thread, the application objects are left out of their namespace.
+	applicationGlobals = ()
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def evaluate(self, code, variables=None):
+		if not variables:
+			return eval(code, self.namespace)
+
+		# Concurrent requests share the persistent namespace, their own variables are bound in a private copy of it.
+		namespace = dict(self.namespace)
+		namespace.update(variables)
+		return eval(code, namespace)
+
+class LanguagesDispatcher(object):
+
+	def __init__(self, languages=()):
+		self.__languages = []
+		self.__pattern = None
+		for language in languages:
+			self.register(language)
+
+	#******************************************************************************************************************
+	#***	Attributes properties.
+	#******************************************************************************************************************
+	@property
+	def languages(self):
+		return tuple(self.__languages)
+
+	@languages.setter
+	def languages(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "languages"))
+
+	@languages.deleter
+	def languages(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "languages"))
+
+	@property
+	def pattern(self):
+		return self.__pattern
+
+	@pattern.setter
+	def pattern(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "pattern"))
+
+	@pattern.deleter
+	def pattern(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "pattern"))
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def register(self, language):
+		if language in self.__languages:
+			return False
+
+		self.__languages.append(language)
+		# Longest languages are tried first so that "PythonScript" is never shadowed by "Python".
+		self.__pattern = re.compile(r"\s*(?P<language>{0})\s*\|".format("|".join(
+		[re.escape(language) for language in sorted(self.__languages, key=len, reverse=True)])))
+		return True
+
+	def dispatch(self, data):
+		match = self.__pattern.match(data)
+		if not match:
+			return None, data
+
+		return match.group("language"), data[match.end():]
+
+class EchoRequestsHandler(SocketServer.BaseRequestHandler):
+
+	def handle(self):
+		while True:
+			data = self.request.recv(1024)
+			if not data or not self.feed(data):
+				break
+		return True
+
+	def feed(self, data):
+		Runtime.metrics.increment("bytesReceived", len(data))
+
+		self.request.sendall(data)
+		return True
+
+	@staticmethod
+	def processData():
+		pass
+
+	@staticmethod
+	def processRequest(request):
+		return True
+
+class StatisticsRequestsHandler(SocketServer.BaseRequestHandler):
+
+	def handle(self):
+		while True:
+			data = self.request.recv(1024)
+			if not data or not self.feed(data):
+				break
+		return True
+
+	def feed(self, data):
+		Runtime.metrics.increment("bytesReceived", len(data))
+
+		# Any received data is answered from the server thread with the statistics as a JSON line.
+		self.request.sendall(json.dumps(_getStatistics(), default=unicode).encode("utf-8") + b"\n")
+		return True
+
+	@staticmethod
+	def processData():
+		pass
+
+	@staticmethod
+	def processRequest(request):
+		return True
+
+class LoggingStackDataRequestsHandler(SocketServer.BaseRequestHandler):
+
+	def handle(self):
+		while True:
+			data = self.request.recv(1024)
+			if not data or not self.feed(data):
+				break
+		return True
+
+	def feed(self, data):
+		Runtime.metrics.increment("bytesReceived", len(data))
+
+		_stackRequest(data, server=self.server)
+		return True
+
+	@staticmethod
+	def processData():
+		Runtime.scheduler.process(Runtime.requestsStack, LoggingStackDataRequestsHandler.processRequest)
+		return True
+
+	@staticmethod
+	def processRequest(request):
+		Runtime.scheduler.addLatency(request)
+		Application.LogMessage(request.data)
+		return True
+
+class DefaultStackDataRequestsHandler(SocketServer.BaseRequestHandler):
+
+	maximumPathLength = 1024
+	# Python scripts encoding declaration, only honored on their first two lines.
+	encodingDeclaration = re.compile(br"[ \t\f]*#.*?coding[:=]")
+
+	def handle(self):
+		while True:
+			data = self.request.recv(1024)
+			if not data or not self.feed(data):
+				break
+		return True
+
+	def feed(self, data):
+		Runtime.metrics.increment("bytesReceived", len(data))
+
+		_stackRequest(data, server=self.server)
+		return True
+
+	@staticmethod
+	def processData():
+		Runtime.scheduler.process(Runtime.requestsStack, DefaultStackDataRequestsHandler.processRequest)
+		return True
+
+	@staticmethod
+	def processRequest(request):
+		data = request.data.strip()
+		language, code = Runtime.languagesDispatcher.dispatch(data)
+		if language:
+			value = Application.ExecuteScriptCode(code, language)
+			Application.LogMessage("{0} | Request return value: '{1}', latency: '{2:.3f}' ms.".format(
+			Constants.name, _getUnicode(value), Runtime.scheduler.addLatency(request)), siConstants.siVerbose)
+		elif DefaultStackDataRequestsHandler.isPath(data):
+			success, value = DefaultStackDataRequestsHandler.executeScript(data)
+			if success:
+				Application.LogMessage("{0} | Request return value: '{1}', latency: '{2:.3f}' ms.".format(
+				Constants.name, _getUnicode(value), Runtime.scheduler.addLatency(request)), siConstants.siVerbose)
+		return True
+
+	@staticmethod
+	def executeScript(path):
+		try:
+			attributes = os.stat(path)
+		except OSError:
+			return False, None
+
+		language = Constants.scriptsLanguages.get(os.path.splitext(path)[1].lower())
+		if language is None or not stat.S_ISREG(attributes.st_mode) or \
+		language == "Python" and not Runtime.compiledExecution:
+			return True, Application.ExecuteScript(path)
+
+		# Scripts are cached by path, size and modification time: A modified script misses the cache and its stale
+		# version ages out of it. Python scripts are cached compiled, their path being given to the tracebacks.
+		key = (path, attributes.st_size, attributes.st_mtime)
+		code = Runtime.scriptsCache.get(key)
+		if code is None:
+			try:
+				with open(path, "rb") as file:
+					code = file.read()
+				# Editors commonly prefix "UTF-8" scripts with a byte order mark, it is not part of the code.
+				if language != "Python":
+					code = code.decode("utf-8-sig")
+				else:
+					# An encoding declaration is not allowed in unicode strings, the declared scripts are compiled
+					# as byte strings.
+					if not any(DefaultStackDataRequestsHandler.encodingDeclaration.match(line)
+								for line in code.split(b"\n", 2)[:2]):
+						code = code.decode("utf-8-sig")
+					code = compile(code, path, "exec", dont_inherit=True)
+			except UnicodeDecodeError:
+				return True, Application.ExecuteScript(path)
+
+			Runtime.scriptsCache.set(key, code, max(1, attributes.st_size))
+
+		if language == "Python":
+			return True, Runtime.executor.executeScript(code, path)
+
+		return True, Application.ExecuteScriptCode(code, language)
+
+	@staticmethod
+	def isPath(data):
+		# Obviously inline payloads are not probed on the file system.
+		return len(data) <= DefaultStackDataRequestsHandler.maximumPathLength and "\n" not in data
+
+class PythonStackDataRequestsHandler(SocketServer.BaseRequestHandler):
+
+	requestEnd = "<!RE>"
+	# Connections are closed once a request end has been received unless they start with the keep alive marker, a
+	# client reading until the connection closes would hold a "Single" mode server otherwise.
+	keepAlive = "<!KA>"
+	streamingSize = 65536
+	# A top level block starts on a line that is neither indented, a comment, a closing bracket nor a clause
+	# continuing the previous statement.
+	blockStart = re.compile(br"(?!(?:else|elif|except|finally)\b)[^\s#)\]}]")
+	# Each request gets a stream identifier shared by its streamed blocks, the latest failed ones are remembered.
+	streams = itertools.count(1)
+	failedStreams = collections.deque(maxlen=64)
+
+	def setup(self):
+		self.__data = bytearray()
+		self.__requestEnd = self.requestEnd.encode("utf-8")
+		self.__keepAliveMarker = self.keepAlive.encode("utf-8")
+		self.__keepAlive = None
+		self.__streamingSize = self.streamingSize
+		self.__stream = next(self.streams)
+
+	def handle(self):
+		try:
+			while True:
+				data = self.request.recv(1024)
+				if not data or not self.feed(data):
+					break
+		except socket.timeout:
+			# An idle connection is closed without executing its incomplete request.
+			del self.__data[:]
+			raise
+		return True
+
+	def feed(self, data):
+		Runtime.metrics.increment("bytesReceived", len(data))
+
+		# Only the previously received data tail is searched again for a request end split across chunks.
+		offset = max(0, len(self.__data) - len(self.__requestEnd) + 1)
+		self.__data.extend(data)
+		if self.__keepAlive is None:
+			if self.__keepAliveMarker.startswith(bytes(self.__data)):
+				return True
+
+			self.__keepAlive = self.__data.startswith(self.__keepAliveMarker)
+			if self.__keepAlive:
+				del self.__data[:len(self.__keepAliveMarker)]
+				offset = 0
+
+		start = 0
+		while True:
+			index = self.__data.find(self.__requestEnd, offset)
+			if index == -1:
+				break
+
+			if index > start:
+				_stackRequest(_getText(self.__data[start:index]), self.__stream, server=self.server)
+			start = offset = index + len(self.__requestEnd)
+			self.__streamingSize = self.streamingSize
+			self.__stream = next(self.streams)
+		del self.__data[:start]
+
+		# The data following the request end of a connection that is not kept alive is discarded.
+		if start and not self.__keepAlive:
+			del self.__data[:]
+			return False
+
+		if Runtime.streamingExecution and Runtime.compiledExecution and len(self.__data) >= self.__streamingSize:
+			self.stream()
+		return True
+
+	def stream(self):
+		# The pending data is compiled up to its last top level block start, the threshold doubles when there is none
+		# or when the data does not compile yet, an unterminated multi-lines string for instance. Only complete lines
+		# are considered, a partially received "finally" line would be taken for a block start otherwise.
+		index = self.__data.rfind(b"\n")
+		while True:
+			index = self.__data.rfind(b"\n", 0, index)
+			if index == -1:
+				self.__streamingSize = len(self.__data) * 2
+				return False
+
+			if self.blockStart.match(self.__data, index + 1):
+				break
+
+		try:
+			code = compile(_getText(self.__data[:index + 1]),
+						"<{0} | Stream>".format(Constants.name),
+						"exec",
+						dont_inherit=True)
+		except SyntaxError:
+			self.__streamingSize = len(self.__data) * 2
+			return False
+
+		_stackRequest(code, self.__stream, server=self.server)
+		Runtime.metrics.increment("blocksStreamed")
+		del self.__data[:index + 1]
+		self.__streamingSize = self.streamingSize
+		return True
+
+	def finish(self):
+		if self.__data.strip():
+			_stackRequest(_getText(self.__data), self.__stream, server=self.server)
+		return True
+
+	@staticmethod
+	def processData():
+		Runtime.scheduler.process(Runtime.requestsStack, PythonStackDataRequestsHandler.processRequest)
+		return True
+
+	@staticmethod
+	def processRequest(request):
+		# The remaining parts of a request are dropped once one of its streamed blocks raised, as the whole request
+		# would have stopped there.
+		if request.identifier in PythonStackDataRequestsHandler.failedStreams:
+			Runtime.metrics.increment("blocksDropped")
+			return False
+
+		try:
+			if type(request.data) is types.CodeType:
+				value = Runtime.executor.evaluate(request.data)
+			elif Runtime.compiledExecution:
+				value = Runtime.executor.execute(request.data)[1]
+			else:
+				value = Application.ExecuteScriptCode(request.data, "Python")
+		except Exception:
+			if type(request.data) is types.CodeType:
+				PythonStackDataRequestsHandler.failedStreams.append(request.identifier)
+			raise
+		Application.LogMessage("{0} | Request return value: '{1}', latency: '{2:.3f}' ms.".format(
+		Constants.name, _getUnicode(value), Runtime.scheduler.addLatency(request)), siConstants.siVerbose)
+		return True
+
+class FramedStackDataRequestsHandler(SocketServer.BaseRequestHandler):
+
+	header = struct.Struct(b"!IIH")
+	# Larger data is meant to be handed over through shared buffers.
+	maximumSize = 256 * 1024 * 1024
+	errorFlag = 0x0001
+	digestFlag = 0x0002
+	statisticsFlag = 0x0004
+	keyFlag = 0x0008
+	highPriorityFlag = 0x0010
+	lowPriorityFlag = 0x0020
+	sharedBufferFlag = 0x0040
+	helloFlag = 0x0080
+	compressedFlag = 0x0100
+	backgroundFlag = 0x0200
+	batchFlag = 0x0400
+	descriptorHeader = struct.Struct(b"!H")
+	chunkSize = 65536
+
+	def setup(self):
+		self.__pending = 0
+		self.__condition = threading.Condition()
+		self.__buffer = bytearray()
+		self.__frame = None
+		self.__decompressor = None
+		self.__inflated = None
+		self.__inflateError = None
+
+	@property
+	def pending(self):
+		return self.__pending
+
+	def handle(self):
+		header = bytearray(self.header.size)
+		while True:
+			if not self.receive(header):
+				break
+
+			size, identifier, flags = self.header.unpack_from(header)
+			if size > self.maximumSize:
+				self.reject(identifier)
+				break
+
+			if flags & self.compressedFlag:
+				if not self.receiveCompressed(identifier, flags, size):
+					break
+				continue
+
+			payload = self.receivePayload(size)
+			if payload is None:
+				break
+
+			self.processFrame(identifier, flags, payload)
+
+		# The connection is kept open until the pending requests responses have been sent.
+		with self.__condition:
+			while self.__pending:
+				self.__condition.wait()
+		return True
+
+	def finish(self):
+		Runtime.responsesWriter.close(self)
+		return True
+
+	def feed(self, data):
+		Runtime.metrics.increment("bytesReceived", len(data))
+
+		# Complete frames are parsed in place, the consumed data is discarded once per received chunk.
+		self.__buffer.extend(data)
+		offset = 0
+		while True:
+			if self.__frame is not None:
+				# Compressed frames are inflated as their chunks arrive instead of once complete.
+				identifier, flags, remaining = self.__frame
+				count = min(remaining, len(self.__buffer) - offset)
+				self.inflate(self.__buffer[offset:offset + count])
+				offset += count
+				if count < remaining:
+					self.__frame[2] = remaining - count
+					break
+
+				self.__frame = None
+				self.finishInflating(identifier, flags)
+				continue
+
+			if len(self.__buffer) - offset < self.header.size:
+				break
+
+			size, identifier, flags = self.header.unpack_from(self.__buffer, offset)
+			if size > self.maximumSize:
+				self.reject(identifier)
+				return False
+
+			if flags & self.compressedFlag:
+				self.startInflating()
+				self.__frame = [identifier, flags, size]
+				offset += self.header.size
+				continue
+
+			end = offset + self.header.size + size
+			if len(self.__buffer) < end:
+				break
+
+			self.processFrame(identifier, flags, self.__buffer[offset + self.header.size:end])
+			offset = end
+		del self.__buffer[:offset]
+		return True
+
+	def processFrame(self, identifier, flags, payload):
+		with self.__condition:
+			self.__pending += 1
+
+		if flags & self.statisticsFlag:
+			# Statistics are answered from the server thread, they stay available while the main thread is busy.
+			self.reply(identifier, self.statisticsFlag, {"value": _getStatistics(), "error": None})
+			return True
+
+		if flags & self.helloFlag:
+			# The client compresses its requests above the threshold once the server accepted the compression.
+			try:
+				requested = json.loads(payload.decode("utf-8")).get("compression", ())
+			except (AttributeError, ValueError):
+				requested = ()
+			compression = "zlib" if Runtime.compression and "zlib" in requested else None
+			# Servers without a connections limit, the Asyncore engine for instance, advertise 0 connections.
+			self.reply(identifier, self.helloFlag, {"value": {"compression": compression,
+															"compressionThreshold": Runtime.compressionThreshold,
+															"connections": getattr(self.server, "connections", 0)},
+													"error": None})
+			return True
+
+		# The request is counted as pending from here, a malformed frame, with invalid "UTF-8" code for instance, is
+		# answered with an error instead of leaving its client waiting.
+		try:
+			return self.stackFrame(identifier, flags, payload)
+		except Exception as error:
+			self.reply(identifier, self.errorFlag, {"value": None,
+													"error": "Invalid request: '{0}'!".format(_getUnicode(error))})
+			return False
+
+	def stackFrame(self, identifier, flags, payload):
+		key = None
+		if flags & self.keyFlag and payload:
+			key = payload[1:payload[0] + 1].decode("utf-8")
+			payload = payload[payload[0] + 1:]
+		sharedBuffer = None
+		if flags & self.sharedBufferFlag and len(payload) >= self.descriptorHeader.size:
+			end = self.descriptorHeader.size + self.descriptorHeader.unpack_from(payload)[0]
+			try:
+				sharedBuffer = json.loads(payload[self.descriptorHeader.size:end].decode("utf-8"))
+			except ValueError as error:
+				self.reply(identifier,
+							self.errorFlag,
+							{"value": None, "error": "Invalid shared buffer descriptor: '{0}'!".format(error)})
+				return False
+			payload = payload[end:]
+		priority = 0 if flags & self.highPriorityFlag else 2 if flags & self.lowPriorityFlag else 1
+		if flags & self.backgroundFlag:
+			# Requests that do not touch the scene bypass the main thread and are executed by the background workers,
+			# their own queue applies the requests queue capacity and overload policy.
+			Runtime.metrics.increment("requestsBackground")
+			if Runtime.backgroundStack.append(Request(payload.decode("utf-8"),
+													identifier,
+													flags,
+													self,
+													key=key,
+													priority=priority,
+													sharedBuffer=sharedBuffer)):
+				Runtime.backgroundWorkers.submit(self.processBackgroundRequests)
+			return True
+
+		_stackRequest(payload.decode("utf-8"), identifier, flags, self, key, priority, self.server, sharedBuffer)
+		return True
+
+	def reject(self, identifier):
+		with self.__condition:
+			self.__pending += 1
+
+		self.reply(identifier, self.errorFlag, {"value": None,
+												"error": "Request size exceeds '{0}' bytes!".format(self.maximumSize)})
+		return True
+
+	def startInflating(self):
+		self.__decompressor = zlib.decompressobj()
+		self.__inflated = bytearray()
+		self.__inflateError = None if Runtime.compression else "Requests compression is disabled!"
+		return True
+
+	def inflate(self, data):
+		if self.__inflateError is not None:
+			return False
+
+		# The decompressed size is bounded so that a small compressed frame cannot exhaust the memory.
+		try:
+			self.__inflated.extend(self.__decompressor.decompress(bytes(data),
+																self.maximumSize + 1 - len(self.__inflated)))
+		except zlib.error as error:
+			self.__inflateError = "Request decompression failed: '{0}'!".format(error)
+			return False
+
+		if len(self.__inflated) > self.maximumSize or self.__decompressor.unconsumed_tail:
+			self.__inflateError = "Request size exceeds '{0}' bytes!".format(self.maximumSize)
+			return False
+		return True
+
+	def finishInflating(self, identifier, flags):
+		if self.__inflateError is None:
+			try:
+				self.__inflated.extend(self.__decompressor.flush())
+			except zlib.error as error:
+				self.__inflateError = "Request decompression failed: '{0}'!".format(error)
+
+		payload, error = self.__inflated, self.__inflateError
+		self.__decompressor = self.__inflated = self.__inflateError = None
+		if error is not None:
+			with self.__condition:
+				self.__pending += 1
+			self.reply(identifier, self.errorFlag, {"value": None, "error": error})
+			return False
+
+		Runtime.metrics.increment("bytesInflated", len(payload))
+		return self.processFrame(identifier, flags & ~self.compressedFlag, payload)
+
+	def receiveCompressed(self, identifier, flags, size):
+		self.startInflating()
+		chunk = bytearray(min(size, self.chunkSize))
+		view = memoryview(chunk)
+		while size:
+			count = min(size, len(chunk))
+			if not self.receive(view[:count]):
+				return False
+
+			self.inflate(chunk[:count])
+			size -= count
+		self.finishInflating(identifier, flags)
+		return True
+
+	def receivePayload(self, size):
+		# The payload grows as its data arrives, a bogus header does not allocate the announced size upfront.
+		payload = bytearray(min(size, self.chunkSize))
+		offset = 0
+		while True:
+			if not self.receive(memoryview(payload)[offset:]):
+				return None
+
+			offset = len(payload)
+			if offset == size:
+				return payload
+
+			payload.extend(bytearray(min(size, offset * 2) - offset))
+
+	def receive(self, buffer):
+		# Data is received directly into the given preallocated buffer, avoiding intermediate chunks copies.
+		view = memoryview(buffer)
+		size = len(buffer)
+		offset = 0
+		while offset < size:
+			try:
+				count = self.request.recv_into(view[offset:], size - offset)
+			except socket.timeout:
+				# A connection waiting for its responses is not idle.
+				if self.__pending:
+					continue
+				raise
+
+			if not count:
+				return False
+
+			offset += count
+		Runtime.metrics.increment("bytesReceived", size)
+		return True
+
+	def send(self, data):
+		try:
+			self.request.sendall(data)
+		except socket.timeout:
+			# A client not reading its responses within the idle timeout would only get truncated frames, its
+			# connection is closed so that the client fails its pending requests instead of waiting for them.
+			Runtime.metrics.increment("responsesTimedOut")
+			try:
+				self.request.shutdown(socket.SHUT_RDWR)
+			except socket.error:
+				pass
+		except socket.error:
+			pass
+		finally:
+			with self.__condition:
+				self.__pending = max(0, self.__pending - 1)
+				self.__condition.notify()
+		return True
+
+	def respond(self, request, response):
+		return self.reply(request.identifier, self.errorFlag if response.get("error") else 0, response)
+
+	def reply(self, identifier, flags, response):
+		# Every response of a connection goes through its responses writer, frames written concurrently by the server
+		# thread would interleave.
+		Runtime.responsesWriter.post(self, self.frame(identifier, flags, response))
+		return True
+
+	@classmethod
+	def frame(cls, identifier, flags, response):
+		try:
+			payload = json.dumps(response, default=_getUnicode).encode("utf-8")
+		except (TypeError, ValueError, UnicodeDecodeError):
+			# Values that cannot be serialized, byte strings that are not UTF-8 for instance, are answered with their
+			# representation.
+			payload = json.dumps(dict(response, value=repr(response.get("value"))), default=_getUnicode).encode("utf-8")
+		return cls.header.pack(len(payload), identifier, flags) + payload
+
+	@staticmethod
+	def processData():
+		Runtime.scheduler.process(Runtime.requestsStack, FramedStackDataRequestsHandler.processRequest)
+		return True
+
+	@staticmethod
+	def processRequest(request):
+		latency = Runtime.scheduler.addLatency(request)
+		start = _getTime()
+		digest = error = None
+		try:
+			if request.sharedBuffer is not None or \
+			request.flags & FramedStackDataRequestsHandler.digestFlag or \
+			Runtime.compiledExecution:
+				digest, value = FramedStackDataRequestsHandler.executeRequest(Runtime.executor, request)
+			else:
+				value = Application.ExecuteScriptCode(request.data, "Python")
+		except Exception as exception:
+			value, error = None, _getUnicode(exception)
+		duration = (_getTime() - start) * 1000.
+
+		# The clients are answered whatever happens while logging, they would wait for their responses forever.
+		try:
+			Application.LogMessage("{0} | '{1}' request return value: '{2}', latency: '{3:.3f}' ms.".format(
+			Constants.name, request.identifier, _getUnicode(value), latency), siConstants.siVerbose)
+			if error:
+				Application.LogMessage("{0} | '{1}' request raised an exception: '{2}'.".format(
+				Constants.name, request.identifier, error), siConstants.siError)
+		finally:
+			response = {"value": value, "error": error, "digest": digest, "latency": latency, "duration": duration}
+			for request in itertools.chain((request,), request.duplicates or ()):
+				request.connection and request.connection.respond(request, response)
+		return True
+
+	@staticmethod
+	def processBackgroundRequests():
+		# Superseded and dropped requests leave the queue shorter than the submitted tasks count.
+		request = Runtime.backgroundStack.popleft()
+		if request is not None:
+			FramedStackDataRequestsHandler.processBackgroundRequest(request)
+		return True
+
+	@staticmethod
+	def processBackgroundRequest(request):
+		# Executed by a background worker: The application objects must not be used, nothing is logged.
+		latency = (_getTime() - request.timestamp) * 1000.
+		start = _getTime()
+		digest = error = None
+		try:
+			digest, value = FramedStackDataRequestsHandler.executeRequest(Runtime.backgroundExecutor, request)
+		except Exception as exception:
+			value, error = None, _getUnicode(exception)
+		duration = (_getTime() - start) * 1000.
+		Runtime.metrics.observe("backgroundExecutionTime", duration)
+
+		request.connection.respond(request, {"value": value,
+											"error": error,
+											"digest": digest,
+											"latency": latency,
+											"duration": duration})
+		return True
+
+	@staticmethod
+	def executeRequest(executor, request):
+		if request.sharedBuffer is None:
+			if request.flags & FramedStackDataRequestsHandler.digestFlag:
+				return executor.executeCached(request.data.strip())
+			return executor.execute(request.data)
+
+		# Shared buffer requests are always executed in process as the buffer is bound into their namespace.
+		with MappedBuffer(request.sharedBuffer) as sharedBuffer:
+			if request.flags & FramedStackDataRequestsHandler.digestFlag:
+				return executor.executeCached(request.data.strip(), {"sharedBuffer": sharedBuffer})
+			return executor.execute(request.data, {"sharedBuffer": sharedBuffer})
+
+class RequestsHandlersRegistry(object):
+
+	def __init__(self, handlers=()):
+		self.__handlers = []
+		self.__names = {}
+		self.__indexes = {}
+
+		for handler in handlers:
+			self.register(handler)
+
+	#******************************************************************************************************************
+	#***	Attributes properties.
+	#******************************************************************************************************************
+	@property
+	def handlers(self):
+		return self.__handlers
+
+	@handlers.setter
+	def handlers(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "handlers"))
+
+	@handlers.deleter
+	def handlers(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "handlers"))
+
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def __getitem__(self, index):
+		return self.__handlers[index]
+
+	def __iter__(self):
+		return iter(self.__handlers)
+
+	def __len__(self):
+		return len(self.__handlers)
+
+	def register(self, handler):
+		assert issubclass(handler, SocketServer.BaseRequestHandler), \
+		"'{0}' attribute: '{1}' is not 'SocketServer.BaseRequestHandler' subclass!".format("handler", handler)
+
+		# Handlers are sorted by name for display, the settings store their name.
+		handlers = [registered for registered in self.__handlers if registered.__name__ != handler.__name__]
+		self.__handlers = sorted(handlers + [handler], key=lambda x: x.__name__)
+		self.__names = dict((registered.__name__, registered) for registered in self.__handlers)
+		self.__indexes = dict((registered, i) for i, registered in enumerate(self.__handlers))
+		return True
+
+	def getHandler(self, name):
+		return self.__names[name]
+
+	def index(self, handler):
+		return self.__indexes[handler]
+
+class SettingsStore(object):
+
+	def __init__(self, category, delay=1000, mirror=None):
+		self.__category = None
+		self.category = category
+		self.__delay = None
+		self.delay = delay
+		self.__mirror = None
+		self.mirror = mirror
+
+		self.__values = {}
+		self.__dirty = set()
+		self.__modified = 0
+
+	#******************************************************************************************************************
+	#***	Attributes properties.
+	#******************************************************************************************************************
+	@property
+	def category(self):
+		return self.__category
 
-__all__ = ["ProgrammingError",
-		"AbstractServerError",
-		"ServerOperationError",
-		"EchoRequestsHandler",
-		"LoggingStackDataRequestsHandler",
-		"DefaultStackDataRequestsHandler",
-		"PythonStackDataRequestsHandler",
-		"Constants",
-		"Runtime",
-		"TCPServer",
-		"XSILoadPlugin",
-		"XSIUnloadPlugin"]
+	@category.setter
+	def category(self, value):
+		assert type(value) in (str, unicode), "'{0}' attribute: '{1}' type is not 'str' or 'unicode'!".format(
+		"category", value)
+		self.__category = value
 
-#**********************************************************************************************************************
-#***	Module classes and definitions.
-#**********************************************************************************************************************
-class ProgrammingError(Exception):
-	pass
+	@category.deleter
+	def category(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "category"))
 
-class AbstractServerError(Exception):
-	pass
+	@property
+	def delay(self):
+		return self.__delay
 
-class ServerOperationError(AbstractServerError):
-	pass
+	@delay.setter
+	def delay(self, value):
+		assert type(value) is int, "'{0}' attribute: '{1}' type is not 'int'!".format("delay", value)
+		assert value >= 0, "'{0}' attribute: '{1}' need to be positive!".format("delay", value)
+		self.__delay = value
 
-class EchoRequestsHandler(SocketServer.BaseRequestHandler):
+	@delay.deleter
+	def delay(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "delay"))
 
-	def handle(self):
-		while True:
-			data = self.request.recv(1024)
-			if not data:
-				break
+	@property
+	def mirror(self):
+		return self.__mirror
 
-			self.request.send(data)
-		return True
+	@mirror.setter
+	def mirror(self, value):
+		if value is not None:
+			assert type(value) in (str, unicode), "'{0}' attribute: '{1}' type is not 'str' or 'unicode'!".format(
+			"mirror", value)
+		self.__mirror = value
 
-	@staticmethod
-	def processData():
-		pass
+	@mirror.deleter
+	def mirror(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "mirror"))
 
-class LoggingStackDataRequestsHandler(SocketServer.BaseRequestHandler):
+	@property
+	def dirty(self):
+		return bool(self.__dirty)
 
-	def handle(self):
-		while True:
-			data = self.request.recv(1024)
-			if not data:
-				break
+	@dirty.setter
+	def dirty(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "dirty"))
 
-			Runtime.requestsStack.append(data)
-		return True
+	@dirty.deleter
+	def dirty(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "dirty"))
 
-	@staticmethod
-	def processData():
-		while Runtime.requestsStack:
-			Application.LogMessage(Runtime.requestsStack.popleft())
-		return True
+	#******************************************************************************************************************
+	#***	Class methods.
+	#******************************************************************************************************************
+	def __contains__(self, name):
+		return name in self.__values
 
-class DefaultStackDataRequestsHandler(SocketServer.BaseRequestHandler):
+	def load(self, names, mirror=None, override=False):
+		# Batch sessions override the preferences with the mirror file, leaving the preferences system untouched,
+		# interactive sessions only read the settings the preferences do not store from it.
+		values = None
+		mirror = mirror or self.__mirror
+		if mirror and os.path.exists(mirror):
+			try:
+				with open(mirror) as file:
+					values = json.load(file)
+				if not isinstance(values, dict):
+					raise ValueError("'{0}' is not a settings object!".format(type(values).__name__))
+			except (IOError, OSError, ValueError) as error:
+				values = None
+				Application.LogMessage(
+				"{0} | Settings mirror '{1}' cannot be read, falling back to the preferences: '{2}'!".format(
+				self.__class__.__name__, mirror, error), siConstants.siWarning)
 
-	def handle(self):
-		while True:
-			data = self.request.recv(1024)
-			if not data:
-				break
+		if values is not None and override:
+			self.__values = values
+		elif Application.Preferences.Categories(self.__category):
+			values = dict(values or {})
+			for name in names:
+				# Settings introduced after the preferences category creation are missing from existing installations.
+				try:
+					value = Application.preferences.GetPreferenceValue("{0}.{1}".format(self.__category, name))
+				except Exception:
+					continue
+				if value is not None:
+					values[name] = value
+			self.__values = values
+		elif values is not None:
+			self.__values = values
+		else:
+			return False
 
-			Runtime.requestsStack.append(data)
+		self.__dirty.clear()
 		return True
 
-	@staticmethod
-	def processData():
-		while Runtime.requestsStack:
-			data = Runtime.requestsStack.popleft().strip()
-			if os.path.exists(data):
-				value = Application.ExecuteScript(data)
-				Application.LogMessage("{0} | Request return value: '{1}'.".format(
-				Constants.name, value), siConstants.siVerbose)
-			else:
-				for language in Constants.languages:
-					match = re.match(r"\s*(?P<language>{0})\s*\|(?P<code>.*)".format(language), data)
-					if match:
-						value = Application.ExecuteScriptCode(match.group("code"), match.group("language"))
-						Application.LogMessage("{0} | Request return value: '{1}'.".format(
-						Constants.name, value), siConstants.siVerbose)
-						break
-		return True
+	def get(self, name, default=None):
+		return self.__values.get(name, default)
 
-class PythonStackDataRequestsHandler(SocketServer.BaseRequestHandler):
+	def set(self, name, value):
+		if name in self.__values and self.__values[name] == value:
+			return False
 
-	requestEnd = "<!RE>"
+		self.__values[name] = value
+		self.__dirty.add(name)
+		self.__modified = _getTime()
+		return True
 
-	def handle(self):
-		allData = []
-		while True:
-			data = self.request.recv(1024)
-			if not data:
-				break
+	def update(self, values):
+		return [self.set(name, value) for name, value in values.iteritems()].count(True)
 
-			if self.requestEnd in data:
-				allData.append(data[:data.find(self.requestEnd)])
-				break
+	def flush(self, force=True):
+		if not self.__dirty:
+			return False
 
-			allData.append(data)
-			if len(allData) >= 1:
-				tail = allData[-2] + allData[-1]
-				if self.requestEnd in tail:
-					allData[-2] = tail[:tail.find(self.requestEnd)]
-					allData.pop()
-					break
+		if not force and (_getTime() - self.__modified) * 1000. < self.__delay:
+			return False
 
-		Runtime.requestsStack.append("".join(allData))
-		return True
+		if Application.Preferences.Categories(self.__category):
+			for name in sorted(self.__dirty):
+				# Settings the preferences cannot store are still kept by the mirror when enabled.
+				try:
+					Application.preferences.SetPreferenceValue("{0}.{1}".format(self.__category, name),
+															self.__values[name])
+				except Exception as error:
+					Application.LogMessage("{0} | '{1}' setting cannot be stored in the preferences: '{2}'!".format(
+					self.__class__.__name__, name, error), siConstants.siWarning)
+		self.__dirty.clear()
 
-	@staticmethod
-	def processData():
-		while Runtime.requestsStack:
-			value = Application.ExecuteScriptCode(Runtime.requestsStack.popleft(), "Python")
-			Application.LogMessage("{0} | Request return value: '{1}'.".format(
-			Constants.name, value), siConstants.siVerbose)
+		if self.__mirror:
+			try:
+				with open(self.__mirror, "w") as file:
+					json.dump(self.__values, file, indent=4, sort_keys=True)
+			except (IOError, OSError) as error:
+				Application.LogMessage("{0} | Settings mirror '{1}' cannot be written: '{2}'!".format(
+				self.__class__.__name__, self.__mirror, error), siConstants.siWarning)
 		return True
 
 class Constants(object):
@@ -266,11 +3220,48 @@ class Constants(object):
 	minorVersion = 2
 	patchVersion = 0
 	settings = "TCPServer_settings_property"
+	settingsMirror = "TCPServer_settings.json"
+	settingsDelay = 1000
+	batchJournal = "TCPServer_batch.json"
 	logo = "pictures/TCPServer_Logo.bmp"
 	defaultAddress = "127.0.0.1"
 	defaultPort = 12288
 	defaultRequestsHandler = DefaultStackDataRequestsHandler
+	# Requests handlers in the order of their index stored by earlier releases settings.
+	legacyRequestsHandlers = ("DefaultStackDataRequestsHandler",
+							"EchoRequestsHandler",
+							"LoggingStackDataRequestsHandler",
+							"PythonStackDataRequestsHandler")
+	engines = ("SocketServer", "Asyncore")
+	defaultEngine = "SocketServer"
+	transports = ("TCP", "Local")
+	defaultTransport = "TCP"
+	listenerModes = ("Single", "ThreadPool")
+	defaultListenerMode = "Single"
+	defaultWorkers = ThreadPoolTCPServer.workers
+	defaultIdleTimeout = 300
+	defaultListeners = ""
+	defaultCompression = True
+	defaultCompressionThreshold = 4096
+	defaultMinimumInterval = 10
+	# The first request reaching an idle server waits for up to the maximum interval.
+	defaultMaximumInterval = 30
+	defaultBackoff = 2.
+	defaultTimeBudget = 50
+	defaultItemsBudget = 0
+	defaultBatchExecution = False
+	defaultCapacity = 16384
+	defaultOverloadPolicy = "Block"
+	defaultDeduplicationWindow = 0
+	defaultStarvationTimeout = 500
+	defaultCompiledExecution = False
+	defaultCodeCacheCapacity = 256
+	defaultScriptsCacheSize = 64
+	defaultStreamingExecution = False
+	defaultBackgroundWorkers = 4
+	defaultSettingsMirror = True
 	languages = ("VBScript", "JScript", "Python", "PythonScript", "PerlScript")
+	scriptsLanguages = {".vbs": "VBScript", ".js": "JScript", ".py": "Python", ".pys": "Python", ".pl": "PerlScript"}
 
 class Runtime(object):
 
@@ -278,20 +3269,81 @@ class Runtime(object):
 	address = Constants.defaultAddress
 	port = Constants.defaultPort
 	requestsHandler = Constants.defaultRequestsHandler
-	requestsStack = collections.deque()
+	engine = Constants.defaultEngine
+	transport = Constants.defaultTransport
+	listenerMode = Constants.defaultListenerMode
+	workers = Constants.defaultWorkers
+	idleTimeout = Constants.defaultIdleTimeout
+	listeners = Constants.defaultListeners
+	requestsHandlers = RequestsHandlersRegistry((DefaultStackDataRequestsHandler,
+												EchoRequestsHandler,
+												FramedStackDataRequestsHandler,
+												LoggingStackDataRequestsHandler,
+												PythonStackDataRequestsHandler,
+												StatisticsRequestsHandler))
+	loadDuration = None
+	startupDuration = None
+	compression = Constants.defaultCompression
+	compressionThreshold = Constants.defaultCompressionThreshold
+	servers = []
+	requestsStack = RequestsQueue(Constants.defaultCapacity,
+								Constants.defaultOverloadPolicy,
+								Constants.defaultDeduplicationWindow,
+								Constants.defaultStarvationTimeout)
+	responsesWriter = ResponsesWriter()
+	compiledExecution = Constants.defaultCompiledExecution
+	streamingExecution = Constants.defaultStreamingExecution
+	executor = PythonExecutor(LRUCache(Constants.defaultCodeCacheCapacity))
+	backgroundExecutor = BackgroundPythonExecutor(LRUCache(Constants.defaultCodeCacheCapacity))
+	backgroundWorkers = WorkersPool(Constants.defaultBackgroundWorkers)
+	backgroundStack = RequestsQueue(Constants.defaultCapacity, Constants.defaultOverloadPolicy)
+	languagesDispatcher = LanguagesDispatcher(Constants.languages)
+	metrics = Metrics()
+	scriptsCache = LRUCache(Constants.defaultScriptsCacheSize * 1024 * 1024)
+	scheduler = TimerScheduler(Constants.defaultMinimumInterval,
+								Constants.defaultMaximumInterval,
+								Constants.defaultBackoff,
+								Constants.defaultTimeBudget,
+								Constants.defaultItemsBudget,
+								Constants.defaultBatchExecution)
+	settings = SettingsStore(Constants.settings, Constants.settingsDelay)
+	settingsMirror = Constants.defaultSettingsMirror
 
 class TCPServer(object):
 
-	def __init__(self, address, port, handler=EchoRequestsHandler):
+	def __init__(self,
+				address,
+				port,
+				handler=EchoRequestsHandler,
+				mode=Constants.defaultListenerMode,
+				workers=Constants.defaultWorkers,
+				engine=Constants.defaultEngine,
+				idleTimeout=Constants.defaultIdleTimeout,
+				requestsStack=None,
+				itemsBudget=0,
+				transport=Constants.defaultTransport):
 		self.__address = None
 		self.address = address
 		self.__port = None
 		self.port = port
 		self.__handler = None
 		self.handler = handler
+		self.__mode = None
+		self.mode = mode
+		self.__workers = None
+		self.workers = workers
+		self.__engine = None
+		self.engine = engine
+		self.__idleTimeout = None
+		self.idleTimeout = idleTimeout
+		self.__requestsStack = None
+		self.requestsStack = requestsStack
+		self.__itemsBudget = None
+		self.itemsBudget = itemsBudget
+		self.__transport = None
+		self.transport = transport
 
 		self.__server = None
-		self.__worker = None
 		self.__online = False
 
 	#******************************************************************************************************************
@@ -342,6 +3394,115 @@ class TCPServer(object):
 	def handler(self):
 		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "handler"))
 
+	@property
+	def mode(self):
+		return self.__mode
+
+	@mode.setter
+	def mode(self, value):
+		if value is not None:
+			assert value in Constants.listenerModes, "'{0}' attribute: '{1}' is not in '{2}' listener modes!".format(
+			"mode", value, Constants.listenerModes)
+		self.__mode = value
+
+	@mode.deleter
+	def mode(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "mode"))
+
+	@property
+	def workers(self):
+		return self.__workers
+
+	@workers.setter
+	def workers(self, value):
+		if value is not None:
+			assert type(value) is int, "'{0}' attribute: '{1}' type is not 'int'!".format(
+			"workers", value)
+			assert value > 0, "'{0}' attribute: '{1}' need to be exactly positive!".format("workers", value)
+		self.__workers = value
+
+	@workers.deleter
+	def workers(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "workers"))
+
+	@property
+	def engine(self):
+		return self.__engine
+
+	@engine.setter
+	def engine(self, value):
+		if value is not None:
+			assert value in Constants.engines, "'{0}' attribute: '{1}' is not in '{2}' engines!".format(
+			"engine", value, Constants.engines)
+		self.__engine = value
+
+	@engine.deleter
+	def engine(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "engine"))
+
+	@property
+	def idleTimeout(self):
+		return self.__idleTimeout
+
+	@idleTimeout.setter
+	def idleTimeout(self, value):
+		if value is not None:
+			assert type(value) is int, "'{0}' attribute: '{1}' type is not 'int'!".format(
+			"idleTimeout", value)
+			assert value >= 0, "'{0}' attribute: '{1}' need to be positive!".format("idleTimeout", value)
+		self.__idleTimeout = value
+
+	@idleTimeout.deleter
+	def idleTimeout(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "idleTimeout"))
+
+	@property
+	def requestsStack(self):
+		return self.__requestsStack
+
+	@requestsStack.setter
+	def requestsStack(self, value):
+		if value is not None:
+			assert type(value) is RequestsQueue, "'{0}' attribute: '{1}' type is not 'RequestsQueue'!".format(
+			"requestsStack", value)
+		self.__requestsStack = value
+
+	@requestsStack.deleter
+	def requestsStack(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(
+		self.__class__.__name__, "requestsStack"))
+
+	@property
+	def itemsBudget(self):
+		return self.__itemsBudget
+
+	@itemsBudget.setter
+	def itemsBudget(self, value):
+		if value is not None:
+			assert type(value) is int, "'{0}' attribute: '{1}' type is not 'int'!".format(
+			"itemsBudget", value)
+			assert value >= 0, "'{0}' attribute: '{1}' need to be positive!".format("itemsBudget", value)
+		self.__itemsBudget = value
+
+	@itemsBudget.deleter
+	def itemsBudget(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "itemsBudget"))
+
+	@property
+	def transport(self):
+		return self.__transport
+
+	@transport.setter
+	def transport(self, value):
+		if value is not None:
+			assert value in Constants.transports, "'{0}' attribute: '{1}' is not in '{2}' transports!".format(
+			"transport", value, Constants.transports)
+		self.__transport = value
+
+	@transport.deleter
+	def transport(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "transport"))
+
 	@property
 	def online(self):
 		return self.__online
@@ -354,6 +3515,20 @@ class TCPServer(object):
 	def online(self):
 		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "online"))
 
+	@property
+	def endpoint(self):
+		if self.__transport == "Local":
+			return "'{0}' local endpoint".format(_getLocalAddress(self.__port))
+		return "'{0}' address and '{1}' port".format(self.__address, self.__port)
+
+	@endpoint.setter
+	def endpoint(self, value):
+		raise ProgrammingError("{0} | '{1}' attribute is read only!".format(self.__class__.__name__, "endpoint"))
+
+	@endpoint.deleter
+	def endpoint(self):
+		raise ProgrammingError("{0} | '{1}' attribute is not deletable!".format(self.__class__.__name__, "endpoint"))
+
 	#******************************************************************************************************************
 	#***	Class methods.
 	#******************************************************************************************************************
@@ -362,21 +3537,48 @@ class TCPServer(object):
 			raise ServerOperationError("{0} | '{1}' server is already online!".format(self.__class__.__name__, self))
 
 		try:
-			self.__server = SocketServer.TCPServer((self.__address, self.__port), self.__handler)
-			self.__worker = threading.Thread(target=self.__server.serve_forever)
-			self.__worker.setDaemon(True)
-			self.__worker.start()
+			# There are no Unix domain sockets on Windows, the local transport uses named pipes with any engine.
+			if self.__transport == "Local" and os.name == "nt":
+				self.__server = NamedPipeServerEngine(self.__address,
+													self.__port,
+													self.__handler,
+													self.__mode,
+													self.__workers,
+													self.__idleTimeout,
+													self.__requestsStack,
+													self.__transport)
+			elif self.__engine == "Asyncore":
+				self.__server = AsyncoreServerEngine(self.__address,
+													self.__port,
+													self.__handler,
+													self.__idleTimeout,
+													self.__requestsStack,
+													self.__transport)
+			else:
+				self.__server = SocketServerEngine(self.__address,
+													self.__port,
+													self.__handler,
+													self.__mode,
+													self.__workers,
+													self.__idleTimeout,
+													self.__requestsStack,
+													self.__transport)
+			self.__server.start()
 			self.__online = True
 			Application.LogMessage(
-			"{0} | Server successfully started on '{1}' address and '{2}' port using '{3}' requests handler!".format(
-			self.__class__.__name__, self.__address, self.__port, self.__handler.__name__),
+			"{0} | Server successfully started on {1} using '{2}' requests handler with '{3}' engine in '{4}' "
+			"mode!".format(self.__class__.__name__,
+							self.endpoint,
+							self.__handler.__name__,
+							"NamedPipe" if isinstance(self.__server, NamedPipeServerEngine) else self.__engine,
+							"EventLoop" if self.__engine == "Asyncore" else self.__mode),
 			siConstants.siInfo)
 			return True
 		except socket.error as error:
-			if error.errno == 10048:
+			if error.errno in (errno.EADDRINUSE, 10048):
 				Application.LogMessage(
-				"{0} | Cannot start server, a connection is already opened on port '{2}'!".format(
-				self.__class__.__name__, self, self.__port), siConstants.siWarning)
+				"{0} | Cannot start server, a connection is already opened on {1}!".format(
+				self.__class__.__name__, self.endpoint), siConstants.siWarning)
 			else:
 				raise error
 
@@ -384,9 +3586,8 @@ class TCPServer(object):
 		if not self.__online:
 			raise ServerOperationError("{0} | '{1}' server is not online!".format(self.__class__.__name__, self))
 
-		self.__server.shutdown()
+		self.__server.stop()
 		self.__server = None
-		self.__worker = None
 		self.__online = False
 		Application.LogMessage("{0} | Server successfully stopped!".format(self.__class__.__name__), siConstants.siInfo)
 		return True
@@ -402,25 +3603,37 @@ def XSILoadPlugin(pluginRegistrar):
 	pluginRegistrar.RegisterEvent("TCPServer_startupEvent", siConstants.siOnStartup)
 	pluginRegistrar.RegisterCommand("TCPServer_start", "TCPServer_start")
 	pluginRegistrar.RegisterCommand("TCPServer_stop", "TCPServer_stop")
-	pluginRegistrar.RegisterTimerEvent("TCPServer_timerEvent", 250, 0)
+	pluginRegistrar.RegisterCommand("TCPServer_registerLanguage", "TCPServer_registerLanguage")
+	pluginRegistrar.RegisterCommand("TCPServer_stats", "TCPServer_stats")
+	pluginRegistrar.RegisterTimerEvent("TCPServer_timerEvent", Constants.defaultMinimumInterval, 0)
 	pluginRegistrar.RegisterMenu(siConstants.siMenuMainApplicationViewsID, "TCPServer")
 
 	pluginRegistrar.RegisterProperty("TCPServer_property");
 
-	Application.LogMessage("'{0}' has been loaded!".format(pluginRegistrar.Name))
+	_registerModule()
+	Runtime.loadDuration = (time.time() - __loadStart__) * 1000.
+	Application.LogMessage("'{0}' has been loaded in '{1:.3f}' ms!".format(pluginRegistrar.Name, Runtime.loadDuration))
 	return True
 
 def XSIUnloadPlugin(pluginRegistrar):
 	_stopServer()
+	Runtime.backgroundWorkers.stop()
+	Runtime.settings.flush()
 	Application.LogMessage("'{0}' has been unloaded!".format(pluginRegistrar.Name))
 	return True
 
 def TCPServer_startupEvent_OnEvent(context):
 	Application.LogMessage("{0} | 'TCPServer_startupEvent_OnEvent' called!".format(
 	Constants.name), siConstants.siVerbose)
+	start = time.time()
 	_registerSettingsProperty()
 	_restoreSettings()
+	Runtime.scheduler.batchScope.journal = _getBatchJournal()
+	Runtime.scheduler.batchScope.recover()
 	_startServer()
+	Runtime.startupDuration = (time.time() - start) * 1000.
+	Application.LogMessage("{0} | Settings restored and server started in '{1:.3f}' ms.".format(
+	Constants.name, Runtime.startupDuration), siConstants.siVerbose)
 	return True
 
 def TCPServer_start_Init(context):
@@ -445,10 +3658,39 @@ def TCPServer_stop_Execute():
 	_stopServer()
 	return True
 
+def TCPServer_stats_Init(context):
+	Application.LogMessage("{0} | 'TCPServer_stats_Init' called!".format(
+	Constants.name), siConstants.siVerbose)
+	return True
+
+def TCPServer_stats_Execute():
+	Application.LogMessage("{0} | 'TCPServer_stats_Execute' called!".format(
+	Constants.name), siConstants.siVerbose)
+	_logStatistics()
+	return json.dumps(_getStatistics(), default=unicode)
+
+def TCPServer_registerLanguage_Init(context):
+	Application.LogMessage("{0} | 'TCPServer_registerLanguage_Init' called!".format(
+	Constants.name), siConstants.siVerbose)
+	context.Source.Arguments.Add("language", siConstants.siArgumentInput)
+	return True
+
+def TCPServer_registerLanguage_Execute(language):
+	Application.LogMessage("{0} | 'TCPServer_registerLanguage_Execute' called!".format(
+	Constants.name), siConstants.siVerbose)
+	Runtime.languagesDispatcher.register(unicode(language))
+	return True
+
 def TCPServer_timerEvent_OnEvent(context):
 	# Application.LogMessage("{0} | 'TCPServer_timerEvent' called!".format(
 	# Constants.name), siConstants.siVerbose)
-	Runtime.requestsHandler.processData()
+	pending = _processRequests()
+	if Runtime.settings.dirty:
+		Runtime.settings.flush(False)
+
+	interval = Runtime.scheduler.interval
+	if Runtime.scheduler.schedule(pending) != interval:
+		context.Source.Reset(Runtime.scheduler.interval, 0)
 	return False
 
 def TCPServer_Init(context):
@@ -462,13 +3704,60 @@ def TCPServer_Preferences_Clicked(context):
 	return True
 
 def TCPServer_property_Define(context):
+	# The PPG logic runs in another scope than the plugin module, its runtime is restored from the stored settings.
+	_isPluginScope() or _restoreSettings()
+
 	property = context.Source
 	property.AddParameter2("Logo_siString", siConstants.siString)
 	property.AddParameter2("Address_siString", siConstants.siString, Runtime.address)
 	property.AddParameter2("Port_siInt", siConstants.siInt4, Runtime.port, 0, 65535, 0, 65535)
 	property.AddParameter2("RequestsHandlers_siInt",
 							siConstants.siInt4,
-							_getRequestsHandlers().index(Runtime.requestsHandler))
+							Runtime.requestsHandlers.index(Runtime.requestsHandler))
+	property.AddParameter2("Engines_siInt", siConstants.siInt4, Constants.engines.index(Runtime.engine))
+	property.AddParameter2("Transports_siInt", siConstants.siInt4, Constants.transports.index(Runtime.transport))
+	property.AddParameter2("ListenerModes_siInt",
+							siConstants.siInt4,
+							Constants.listenerModes.index(Runtime.listenerMode))
+	property.AddParameter2("Workers_siInt", siConstants.siInt4, Runtime.workers, 1, 256, 1, 64)
+	property.AddParameter2("IdleTimeout_siInt", siConstants.siInt4, Runtime.idleTimeout, 0, 86400, 0, 3600)
+	property.AddParameter2("Listeners_siString", siConstants.siString, Runtime.listeners)
+	property.AddParameter2("Compression_siBool", siConstants.siBool, Runtime.compression)
+	property.AddParameter2("CompressionThreshold_siInt",
+							siConstants.siInt4,
+							Runtime.compressionThreshold, 0, 1073741824, 0, 1048576)
+	property.AddParameter2("MinimumInterval_siInt",
+							siConstants.siInt4,
+							Runtime.scheduler.minimumInterval, 1, 1000, 1, 1000)
+	property.AddParameter2("MaximumInterval_siInt",
+							siConstants.siInt4,
+							Runtime.scheduler.maximumInterval, 1, 10000, 1, 1000)
+	property.AddParameter2("Backoff_siDouble", siConstants.siDouble, Runtime.scheduler.backoff, 1, 16, 1, 4)
+	property.AddParameter2("TimeBudget_siInt", siConstants.siInt4, Runtime.scheduler.timeBudget, 0, 10000, 0, 1000)
+	property.AddParameter2("ItemsBudget_siInt", siConstants.siInt4, Runtime.scheduler.itemsBudget, 0, 1000000, 0, 10000)
+	property.AddParameter2("BatchExecution_siBool", siConstants.siBool, Runtime.scheduler.batchExecution)
+	property.AddParameter2("Capacity_siInt", siConstants.siInt4, Runtime.requestsStack.capacity, 0, 16777216, 0, 65536)
+	property.AddParameter2("OverloadPolicies_siInt",
+							siConstants.siInt4,
+							RequestsQueue.policies.index(Runtime.requestsStack.policy))
+	property.AddParameter2("DeduplicationWindow_siInt",
+							siConstants.siInt4,
+							Runtime.requestsStack.deduplicationWindow, 0, 60000, 0, 1000)
+	property.AddParameter2("StarvationTimeout_siInt",
+							siConstants.siInt4,
+							Runtime.requestsStack.starvationTimeout, 0, 600000, 0, 10000)
+	property.AddParameter2("CompiledExecution_siBool", siConstants.siBool, Runtime.compiledExecution)
+	property.AddParameter2("CodeCacheCapacity_siInt",
+							siConstants.siInt4,
+							Runtime.executor.cache.capacity, 1, 65536, 1, 4096)
+	property.AddParameter2("ScriptsCacheSize_siInt",
+							siConstants.siInt4,
+							Runtime.scriptsCache.capacity // (1024 * 1024), 1, 4096, 1, 1024)
+	property.AddParameter2("StreamingExecution_siBool", siConstants.siBool, Runtime.streamingExecution)
+	property.AddParameter2("BackgroundWorkers_siInt",
+							siConstants.siInt4,
+							Runtime.backgroundWorkers.workers, 1, 256, 1, 64)
+	property.AddParameter2("SettingsMirror_siBool", siConstants.siBool, Runtime.settingsMirror)
 	return True
 
 def TCPServer_property_DefineLayout(context):
@@ -482,10 +3771,54 @@ def TCPServer_property_DefineLayout(context):
 	layout.AddGroup("Server", True, 0)
 	layout.AddItem("Address_siString", "Address")
 	layout.AddItem("Port_siInt", "Port")
-	requestsHandlers = [requestsHandler.__name__ for requestsHandler in _getRequestsHandlers()]
+	requestsHandlers = [requestsHandler.__name__ for requestsHandler in Runtime.requestsHandlers]
 	layout.AddEnumControl("RequestsHandlers_siInt",
 						list(itertools.chain.from_iterable(zip(requestsHandlers, range(len(requestsHandlers))))),
 						"Requests Handlers", siConstants.siControlCombo)
+	layout.AddEnumControl("Engines_siInt",
+						list(itertools.chain.from_iterable(zip(Constants.engines, range(len(Constants.engines))))),
+						"Engine", siConstants.siControlCombo)
+	layout.AddEnumControl("Transports_siInt",
+						list(itertools.chain.from_iterable(zip(Constants.transports,
+															range(len(Constants.transports))))),
+						"Transport", siConstants.siControlCombo)
+	layout.AddEnumControl("ListenerModes_siInt",
+						list(itertools.chain.from_iterable(zip(Constants.listenerModes,
+															range(len(Constants.listenerModes))))),
+						"Listener Mode", siConstants.siControlCombo)
+	layout.AddItem("Workers_siInt", "Workers")
+	layout.AddItem("IdleTimeout_siInt", "Idle Timeout (s)")
+	layout.AddItem("Listeners_siString", "Listeners")
+	layout.AddItem("Compression_siBool", "Compression")
+	layout.AddItem("CompressionThreshold_siInt", "Compression Threshold (bytes)")
+	layout.AddItem("SettingsMirror_siBool", "Settings Mirror")
+	layout.EndGroup()
+
+	layout.AddGroup("Scheduler", True, 0)
+	layout.AddItem("MinimumInterval_siInt", "Minimum Interval (ms)")
+	layout.AddItem("MaximumInterval_siInt", "Maximum Interval (ms)")
+	layout.AddItem("Backoff_siDouble", "Backoff")
+	layout.AddItem("TimeBudget_siInt", "Time Budget (ms)")
+	layout.AddItem("ItemsBudget_siInt", "Items Budget")
+	layout.AddItem("BatchExecution_siBool", "Batch Execution")
+	layout.EndGroup()
+
+	layout.AddGroup("Requests Queue", True, 0)
+	layout.AddItem("Capacity_siInt", "Capacity")
+	layout.AddEnumControl("OverloadPolicies_siInt",
+						list(itertools.chain.from_iterable(zip(RequestsQueue.policies,
+															range(len(RequestsQueue.policies))))),
+						"Overload Policy", siConstants.siControlCombo)
+	layout.AddItem("DeduplicationWindow_siInt", "Deduplication Window (ms)")
+	layout.AddItem("StarvationTimeout_siInt", "Starvation Timeout (ms)")
+	layout.EndGroup()
+
+	layout.AddGroup("Python Execution", True, 0)
+	layout.AddItem("CompiledExecution_siBool", "Compiled Execution")
+	layout.AddItem("CodeCacheCapacity_siInt", "Code Cache Capacity")
+	layout.AddItem("ScriptsCacheSize_siInt", "Scripts Cache Size (MB)")
+	layout.AddItem("StreamingExecution_siBool", "Streaming Execution")
+	layout.AddItem("BackgroundWorkers_siInt", "Background Workers")
 	layout.EndGroup()
 
 	# layout.AddGroup()
@@ -525,7 +3858,7 @@ def TCPServer_property_Port_siInt_OnChanged():
 	return True
 
 def TCPServer_property_RequestsHandlers_siInt_OnChanged():
-	Runtime.requestsHandler = _getRequestsHandlers()[PPG.RequestsHandlers_siInt.Value]
+	Runtime.requestsHandler = Runtime.requestsHandlers[PPG.RequestsHandlers_siInt.Value]
 	_storeSettings()
 
 	# module = _getModule()
@@ -533,11 +3866,135 @@ def TCPServer_property_RequestsHandlers_siInt_OnChanged():
 	# 	return
 
 	# module.Runtime.requestsHandler = getattr(_getModule(),
-	# _getRequestsHandlers()[PPG.RequestsHandlers_siInt.Value].__name__)
+	# Runtime.requestsHandlers[PPG.RequestsHandlers_siInt.Value].__name__)
 	# module._storeSettings()
 	# module._restartServer()
 	return True
 
+def TCPServer_property_Engines_siInt_OnChanged():
+	Runtime.engine = Constants.engines[PPG.Engines_siInt.Value]
+	_storeSettings()
+	return True
+
+def TCPServer_property_Transports_siInt_OnChanged():
+	Runtime.transport = Constants.transports[PPG.Transports_siInt.Value]
+	_storeSettings()
+	return True
+
+def TCPServer_property_ListenerModes_siInt_OnChanged():
+	Runtime.listenerMode = Constants.listenerModes[PPG.ListenerModes_siInt.Value]
+	_storeSettings()
+	return True
+
+def TCPServer_property_Workers_siInt_OnChanged():
+	Runtime.workers = PPG.Workers_siInt.Value
+	_storeSettings()
+	return True
+
+def TCPServer_property_IdleTimeout_siInt_OnChanged():
+	Runtime.idleTimeout = PPG.IdleTimeout_siInt.Value
+	_storeSettings()
+	return True
+
+def TCPServer_property_Listeners_siString_OnChanged():
+	Runtime.listeners = PPG.Listeners_siString.Value
+	_storeSettings()
+	return True
+
+def TCPServer_property_Compression_siBool_OnChanged():
+	Runtime.compression = bool(PPG.Compression_siBool.Value)
+	_storeSettings()
+	return True
+
+def TCPServer_property_CompressionThreshold_siInt_OnChanged():
+	Runtime.compressionThreshold = PPG.CompressionThreshold_siInt.Value
+	_storeSettings()
+	return True
+
+def TCPServer_property_MinimumInterval_siInt_OnChanged():
+	Runtime.scheduler.minimumInterval = PPG.MinimumInterval_siInt.Value
+	_storeSettings()
+	return True
+
+def TCPServer_property_MaximumInterval_siInt_OnChanged():
+	Runtime.scheduler.maximumInterval = PPG.MaximumInterval_siInt.Value
+	_storeSettings()
+	return True
+
+def TCPServer_property_Backoff_siDouble_OnChanged():
+	Runtime.scheduler.backoff = float(PPG.Backoff_siDouble.Value)
+	_storeSettings()
+	return True
+
+def TCPServer_property_TimeBudget_siInt_OnChanged():
+	Runtime.scheduler.timeBudget = PPG.TimeBudget_siInt.Value
+	_storeSettings()
+	return True
+
+def TCPServer_property_ItemsBudget_siInt_OnChanged():
+	Runtime.scheduler.itemsBudget = PPG.ItemsBudget_siInt.Value
+	_storeSettings()
+	return True
+
+def TCPServer_property_BatchExecution_siBool_OnChanged():
+	Runtime.scheduler.batchExecution = bool(PPG.BatchExecution_siBool.Value)
+	_storeSettings()
+	return True
+
+def TCPServer_property_Capacity_siInt_OnChanged():
+	Runtime.requestsStack.capacity = PPG.Capacity_siInt.Value
+	Runtime.backgroundStack.capacity = PPG.Capacity_siInt.Value
+	_storeSettings()
+	return True
+
+def TCPServer_property_OverloadPolicies_siInt_OnChanged():
+	Runtime.requestsStack.policy = RequestsQueue.policies[PPG.OverloadPolicies_siInt.Value]
+	Runtime.backgroundStack.policy = Runtime.requestsStack.policy
+	_storeSettings()
+	return True
+
+def TCPServer_property_DeduplicationWindow_siInt_OnChanged():
+	Runtime.requestsStack.deduplicationWindow = PPG.DeduplicationWindow_siInt.Value
+	_storeSettings()
+	return True
+
+def TCPServer_property_StarvationTimeout_siInt_OnChanged():
+	Runtime.requestsStack.starvationTimeout = PPG.StarvationTimeout_siInt.Value
+	_storeSettings()
+	return True
+
+def TCPServer_property_CompiledExecution_siBool_OnChanged():
+	Runtime.compiledExecution = bool(PPG.CompiledExecution_siBool.Value)
+	_storeSettings()
+	return True
+
+def TCPServer_property_CodeCacheCapacity_siInt_OnChanged():
+	Runtime.executor.cache.capacity = PPG.CodeCacheCapacity_siInt.Value
+	Runtime.backgroundExecutor.cache.capacity = PPG.CodeCacheCapacity_siInt.Value
+	_storeSettings()
+	return True
+
+def TCPServer_property_ScriptsCacheSize_siInt_OnChanged():
+	Runtime.scriptsCache.capacity = PPG.ScriptsCacheSize_siInt.Value * 1024 * 1024
+	_storeSettings()
+	return True
+
+def TCPServer_property_StreamingExecution_siBool_OnChanged():
+	Runtime.streamingExecution = bool(PPG.StreamingExecution_siBool.Value)
+	_storeSettings()
+	return True
+
+def TCPServer_property_BackgroundWorkers_siInt_OnChanged():
+	Runtime.backgroundWorkers.workers = PPG.BackgroundWorkers_siInt.Value
+	_storeSettings()
+	return True
+
+def TCPServer_property_SettingsMirror_siBool_OnChanged():
+	Runtime.settingsMirror = bool(PPG.SettingsMirror_siBool.Value)
+	Runtime.settings.mirror = _getSettingsMirror() if Runtime.settingsMirror else None
+	_storeSettings()
+	return True
+
 def TCPServer_property_Start_Server_button_OnClicked():
 	# module = _getModule()
 	# if not module:
@@ -556,34 +4013,199 @@ def TCPServer_property_Stop_Server_button_OnClicked():
 
 
 def _registerSettingsProperty():
-	if not Application.Preferences.Categories(Constants.settings):
-		property = Application.ActiveSceneRoot.AddCustomProperty(Constants.settings);
-		property.AddParameter2("Address_siString", siConstants.siString, Constants.defaultAddress)
-		property.AddParameter2("Port_siInt", siConstants.siInt4, Constants.defaultPort, 0, 65535, 0, 65535)
-		property.AddParameter2("RequestsHandler_siInt",
-								siConstants.siInt4,
-								_getRequestsHandlers().index(Constants.defaultRequestsHandler))
-		Application.InstallCustomPreferences("TCPServer_settings_property", "TCPServer_settings_property")
+	category = Application.Preferences.Categories(Constants.settings)
+	if category:
+		# Parameters introduced after the category creation are added to it, upgraded installations would miss them
+		# otherwise.
+		for parameter in _getSettingsParameters():
+			if category.Parameters(parameter[0]):
+				continue
+
+			try:
+				category.AddParameter2(*parameter)
+			except Exception as error:
+				Application.LogMessage("{0} | '{1}' setting cannot be added to the preferences: '{2}'!".format(
+				Constants.name, parameter[0], error), siConstants.siWarning)
+		return True
+
+	property = Application.ActiveSceneRoot.AddCustomProperty(Constants.settings);
+	for parameter in _getSettingsParameters():
+		property.AddParameter2(*parameter)
+	Application.InstallCustomPreferences("TCPServer_settings_property", "TCPServer_settings_property")
 	return True
 
+def _getSettingsParameters():
+	return (("Address_siString", siConstants.siString, Constants.defaultAddress),
+			("Port_siInt", siConstants.siInt4, Constants.defaultPort, 0, 65535, 0, 65535),
+			("RequestsHandler_siString", siConstants.siString, Constants.defaultRequestsHandler.__name__),
+			("RequestsHandler_siInt",
+				siConstants.siInt4,
+				_getLegacyRequestsHandlerIndex(Constants.defaultRequestsHandler.__name__)),
+			("Engine_siInt", siConstants.siInt4, Constants.engines.index(Constants.defaultEngine)),
+			("Transport_siInt", siConstants.siInt4, Constants.transports.index(Constants.defaultTransport)),
+			("ListenerMode_siInt", siConstants.siInt4, Constants.listenerModes.index(Constants.defaultListenerMode)),
+			("Workers_siInt", siConstants.siInt4, Constants.defaultWorkers, 1, 256, 1, 64),
+			("IdleTimeout_siInt", siConstants.siInt4, Constants.defaultIdleTimeout, 0, 86400, 0, 3600),
+			("Listeners_siString", siConstants.siString, Constants.defaultListeners),
+			("Compression_siBool", siConstants.siBool, Constants.defaultCompression),
+			("CompressionThreshold_siInt", siConstants.siInt4, Constants.defaultCompressionThreshold,
+				0, 1073741824, 0, 1048576),
+			("MinimumInterval_siInt", siConstants.siInt4, Constants.defaultMinimumInterval, 1, 1000, 1, 1000),
+			("MaximumInterval_siInt", siConstants.siInt4, Constants.defaultMaximumInterval, 1, 10000, 1, 1000),
+			("Backoff_siDouble", siConstants.siDouble, Constants.defaultBackoff, 1, 16, 1, 4),
+			("TimeBudget_siInt", siConstants.siInt4, Constants.defaultTimeBudget, 0, 10000, 0, 1000),
+			("ItemsBudget_siInt", siConstants.siInt4, Constants.defaultItemsBudget, 0, 1000000, 0, 10000),
+			("BatchExecution_siBool", siConstants.siBool, Constants.defaultBatchExecution),
+			("Capacity_siInt", siConstants.siInt4, Constants.defaultCapacity, 0, 16777216, 0, 65536),
+			("OverloadPolicy_siInt", siConstants.siInt4, RequestsQueue.policies.index(Constants.defaultOverloadPolicy)),
+			("DeduplicationWindow_siInt", siConstants.siInt4, Constants.defaultDeduplicationWindow, 0, 60000, 0, 1000),
+			("StarvationTimeout_siInt", siConstants.siInt4, Constants.defaultStarvationTimeout, 0, 600000, 0, 10000),
+			("CompiledExecution_siBool", siConstants.siBool, Constants.defaultCompiledExecution),
+			("CodeCacheCapacity_siInt", siConstants.siInt4, Constants.defaultCodeCacheCapacity, 1, 65536, 1, 4096),
+			("ScriptsCacheSize_siInt", siConstants.siInt4, Constants.defaultScriptsCacheSize, 1, 4096, 1, 1024),
+			("StreamingExecution_siBool", siConstants.siBool, Constants.defaultStreamingExecution),
+			("BackgroundWorkers_siInt", siConstants.siInt4, Constants.defaultBackgroundWorkers, 1, 256, 1, 64),
+			("SettingsMirror_siBool", siConstants.siBool, Constants.defaultSettingsMirror))
+
+def _getSettings():
+	return {"Address_siString": Runtime.address,
+			"Port_siInt": Runtime.port,
+			"RequestsHandler_siString": Runtime.requestsHandler.__name__,
+			"RequestsHandler_siInt": _getLegacyRequestsHandlerIndex(Runtime.requestsHandler.__name__),
+			"Engine_siInt": Constants.engines.index(Runtime.engine),
+			"Transport_siInt": Constants.transports.index(Runtime.transport),
+			"ListenerMode_siInt": Constants.listenerModes.index(Runtime.listenerMode),
+			"Workers_siInt": Runtime.workers,
+			"IdleTimeout_siInt": Runtime.idleTimeout,
+			"Listeners_siString": Runtime.listeners,
+			"Compression_siBool": Runtime.compression,
+			"CompressionThreshold_siInt": Runtime.compressionThreshold,
+			"MinimumInterval_siInt": Runtime.scheduler.minimumInterval,
+			"MaximumInterval_siInt": Runtime.scheduler.maximumInterval,
+			"Backoff_siDouble": Runtime.scheduler.backoff,
+			"TimeBudget_siInt": Runtime.scheduler.timeBudget,
+			"ItemsBudget_siInt": Runtime.scheduler.itemsBudget,
+			"BatchExecution_siBool": Runtime.scheduler.batchExecution,
+			"Capacity_siInt": Runtime.requestsStack.capacity,
+			"OverloadPolicy_siInt": RequestsQueue.policies.index(Runtime.requestsStack.policy),
+			"DeduplicationWindow_siInt": Runtime.requestsStack.deduplicationWindow,
+			"StarvationTimeout_siInt": Runtime.requestsStack.starvationTimeout,
+			"CompiledExecution_siBool": Runtime.compiledExecution,
+			"CodeCacheCapacity_siInt": Runtime.executor.cache.capacity,
+			"ScriptsCacheSize_siInt": Runtime.scriptsCache.capacity // (1024 * 1024),
+			"StreamingExecution_siBool": Runtime.streamingExecution,
+			"BackgroundWorkers_siInt": Runtime.backgroundWorkers.workers,
+			"SettingsMirror_siBool": Runtime.settingsMirror}
+
+def _getRequestsHandler(settings):
+	# Earlier releases stored the requests handler index, it is migrated once to the handler name.
+	name = settings.get("RequestsHandler_siString")
+	index = settings.get("RequestsHandler_siInt")
+	if index is not None and 0 <= int(index) < len(Constants.legacyRequestsHandlers):
+		# The index is still stored for earlier releases, one that does not match the handler name has been changed
+		# by such a release since.
+		if name is None or _getLegacyRequestsHandlerIndex(name) != int(index):
+			name = Constants.legacyRequestsHandlers[int(index)]
+			settings.set("RequestsHandler_siString", name)
+
+	try:
+		return Runtime.requestsHandlers.getHandler(name or Constants.defaultRequestsHandler.__name__)
+	except KeyError:
+		return Constants.defaultRequestsHandler
+
+def _getLegacyRequestsHandlerIndex(name):
+	# Handlers unknown to earlier releases are stored as the default one.
+	if name not in Constants.legacyRequestsHandlers:
+		name = Constants.defaultRequestsHandler.__name__
+	return Constants.legacyRequestsHandlers.index(name)
+
+def _getSettingsMirror():
+	return os.path.normpath(os.path.join(__sipath__, "..", "..", "Data", Constants.settingsMirror))
+
+def _getBatchJournal():
+	return os.path.normpath(os.path.join(__sipath__, "..", "..", "Data", Constants.batchJournal))
+
 def _storeSettings():
-	if Application.Preferences.Categories(Constants.settings):
-		Application.preferences.SetPreferenceValue("{0}.Address_siString".format(Constants.settings), Runtime.address)
-		Application.preferences.SetPreferenceValue("{0}.Port_siInt".format(Constants.settings), Runtime.port)
-		Application.preferences.SetPreferenceValue(
-		"{0}.RequestsHandler_siInt".format(Constants.settings), _getRequestsHandlers().index(Runtime.requestsHandler))
+	# Values are cached here, the plugin module timer event flushes them in a single batch once the changes settle.
+	Runtime.settings.mirror = _getSettingsMirror() if Runtime.settingsMirror else None
+	if _isPluginScope():
+		Runtime.settings.update(_getSettings())
+		return True
+
+	# The PPG logic runs in another scope than the plugin module: Its store is loaded first so that only the changed
+	# settings are written, and flushed right away as nothing else would ever flush it.
+	Runtime.settings.load(_getSettings().keys(), _getSettingsMirror(), not getattr(Application, "Interactive", True))
+	Runtime.settings.update(_getSettings())
+	Runtime.settings.flush()
 	return True
 
+def _isPluginScope():
+	module = _getModule()
+	return module is not None and getattr(module, "Runtime", None) is Runtime
+
 def _restoreSettings():
-	if Application.Preferences.Categories(Constants.settings):
-		Runtime.address = unicode(Application.preferences.GetPreferenceValue("{0}.Address_siString".format(Constants.settings)))
-		Runtime.port = int(Application.preferences.GetPreferenceValue("{0}.Port_siInt".format(Constants.settings)))
-		Runtime.requestsHandler = _getRequestsHandlers()[int(Application.preferences.GetPreferenceValue(
-		"{0}.RequestsHandler_siInt".format(Constants.settings)))]
+	settings = Runtime.settings
+	mirror = _getSettingsMirror()
+	if not settings.load(_getSettings().keys(), mirror, not getattr(Application, "Interactive", True)):
+		return False
+
+	Runtime.address = unicode(settings.get("Address_siString", Constants.defaultAddress))
+	Runtime.port = int(settings.get("Port_siInt", Constants.defaultPort))
+	Runtime.requestsHandler = _getRequestsHandler(settings)
+	Runtime.engine = Constants.engines[int(settings.get(
+	"Engine_siInt", Constants.engines.index(Constants.defaultEngine)))]
+	Runtime.transport = Constants.transports[int(settings.get(
+	"Transport_siInt", Constants.transports.index(Constants.defaultTransport)))]
+	Runtime.listenerMode = Constants.listenerModes[int(settings.get(
+	"ListenerMode_siInt", Constants.listenerModes.index(Constants.defaultListenerMode)))]
+	Runtime.workers = int(settings.get("Workers_siInt", Constants.defaultWorkers))
+	Runtime.idleTimeout = int(settings.get("IdleTimeout_siInt", Constants.defaultIdleTimeout))
+	Runtime.listeners = unicode(settings.get("Listeners_siString", Constants.defaultListeners))
+	Runtime.compression = bool(settings.get("Compression_siBool", Constants.defaultCompression))
+	Runtime.compressionThreshold = int(settings.get("CompressionThreshold_siInt",
+													Constants.defaultCompressionThreshold))
+	Runtime.scheduler.minimumInterval = int(settings.get("MinimumInterval_siInt", Constants.defaultMinimumInterval))
+	Runtime.scheduler.maximumInterval = int(settings.get("MaximumInterval_siInt", Constants.defaultMaximumInterval))
+	Runtime.scheduler.backoff = float(settings.get("Backoff_siDouble", Constants.defaultBackoff))
+	Runtime.scheduler.timeBudget = int(settings.get("TimeBudget_siInt", Constants.defaultTimeBudget))
+	Runtime.scheduler.itemsBudget = int(settings.get("ItemsBudget_siInt", Constants.defaultItemsBudget))
+	Runtime.scheduler.batchExecution = bool(settings.get("BatchExecution_siBool", Constants.defaultBatchExecution))
+	Runtime.requestsStack.capacity = int(settings.get("Capacity_siInt", Constants.defaultCapacity))
+	Runtime.requestsStack.policy = RequestsQueue.policies[int(settings.get(
+	"OverloadPolicy_siInt", RequestsQueue.policies.index(Constants.defaultOverloadPolicy)))]
+	Runtime.backgroundStack.capacity = Runtime.requestsStack.capacity
+	Runtime.backgroundStack.policy = Runtime.requestsStack.policy
+	Runtime.requestsStack.deduplicationWindow = int(settings.get("DeduplicationWindow_siInt",
+																Constants.defaultDeduplicationWindow))
+	Runtime.requestsStack.starvationTimeout = int(settings.get("StarvationTimeout_siInt",
+																Constants.defaultStarvationTimeout))
+	Runtime.compiledExecution = bool(settings.get("CompiledExecution_siBool", Constants.defaultCompiledExecution))
+	Runtime.executor.cache.capacity = int(settings.get("CodeCacheCapacity_siInt", Constants.defaultCodeCacheCapacity))
+	Runtime.backgroundExecutor.cache.capacity = Runtime.executor.cache.capacity
+	Runtime.scriptsCache.capacity = int(settings.get("ScriptsCacheSize_siInt",
+													Constants.defaultScriptsCacheSize)) * 1024 * 1024
+	Runtime.streamingExecution = bool(settings.get("StreamingExecution_siBool", Constants.defaultStreamingExecution))
+	Runtime.backgroundWorkers.workers = int(settings.get("BackgroundWorkers_siInt", Constants.defaultBackgroundWorkers))
+	Runtime.settingsMirror = bool(settings.get("SettingsMirror_siBool", Constants.defaultSettingsMirror))
+	settings.mirror = mirror if Runtime.settingsMirror else None
 	return True
 
-def _getServer(address, port, requestsHandler):
-	return TCPServer(address, port, requestsHandler)
+def _getServer(address,
+			port,
+			requestsHandler,
+			listenerMode=Constants.defaultListenerMode,
+			workers=Constants.defaultWorkers,
+			engine=Constants.defaultEngine,
+			idleTimeout=Constants.defaultIdleTimeout,
+			transport=Constants.defaultTransport):
+	return TCPServer(address,
+					port,
+					requestsHandler,
+					listenerMode,
+					workers,
+					engine,
+					idleTimeout,
+					transport=transport)
 
 def _startServer():
 	if Runtime.server:
@@ -591,17 +4213,52 @@ def _startServer():
 			Application.LogMessage("{0} | The server is already online!".format(Constants.name), siConstants.siWarning)
 			return
 
-	Runtime.server = _getServer(Runtime.address, Runtime.port, Runtime.requestsHandler)
+	Runtime.server = _getServer(Runtime.address,
+								Runtime.port,
+								Runtime.requestsHandler,
+								Runtime.listenerMode,
+								Runtime.workers,
+								Runtime.engine,
+								Runtime.idleTimeout,
+								Runtime.transport)
 	Runtime.server.start()
+	# The listeners are only started along with the main server, they would be left running otherwise.
+	if not Runtime.server.online:
+		return False
+
+	Runtime.servers = []
+	for server in _getListeners(Runtime.listeners):
+		server.start()
+		server.online and Runtime.servers.append(server)
 	return True
 
 def _stopServer():
 	if Runtime.server:
 		if not Runtime.server.online:
+			_stopListeners()
+			Runtime.servers = []
 			Application.LogMessage("{0} | The server is not online!".format(Constants.name), siConstants.siWarning)
 			return
 
 	Runtime.server and Runtime.server.stop()
+	_stopListeners()
+
+	_logStatistics()
+	Runtime.scheduler.reset()
+	Runtime.requestsStack.reset()
+	Runtime.servers = []
+	Runtime.executor.cache.reset()
+	Runtime.scriptsCache.reset()
+	Runtime.metrics.reset()
+	return True
+
+def _stopListeners():
+	# The listeners requests queues are discarded with them, their requests are answered with an error before and
+	# after stopping them: A listener serving its connection from its own thread waits for its pending responses.
+	for server in Runtime.servers:
+		server.requestsStack.drain("Server stopped, request cancelled!")
+		server.online and server.stop()
+		server.requestsStack.drain("Server stopped, request cancelled!")
 	return True
 
 def _restartServer():
@@ -611,35 +4268,189 @@ def _restartServer():
 	_startServer()
 	return True
 
-def _getModule():
-	# Garbage Collector wizardry to retrieve the actual module object.
-	import gc
-	for object in gc.get_objects():
-		if not hasattr(object, "__uid__"):
-			continue
+def _getStatistics():
+	return {"metrics": Runtime.metrics.getSnapshot(),
+			"latency": Runtime.scheduler.latency,
+			"throughput": Runtime.scheduler.throughput,
+			"requestsQueue": Runtime.requestsStack.statistics,
+			"listeners": [{"address": server.address,
+							"port": server.port,
+							"transport": server.transport,
+							"handler": server.handler.__name__,
+							"online": server.online,
+							"requestsQueue": server.requestsStack.statistics} for server in Runtime.servers],
+			"codeCache": Runtime.executor.cache.statistics,
+			"backgroundWorkers": Runtime.backgroundWorkers.statistics,
+			"backgroundQueue": Runtime.backgroundStack.statistics,
+			"scriptsCache": Runtime.scriptsCache.statistics,
+			"startup": {"load": Runtime.loadDuration, "startup": Runtime.startupDuration}}
+
+def _logStatistics():
+	latency = Runtime.scheduler.latency
+	Application.LogMessage(
+	"{0} | '{1}' requests processed with '{2:.3f}' ms average and '{3:.3f}' ms maximum latency.".format(
+	Constants.name, latency["requests"], latency["average"], latency["maximum"]), siConstants.siInfo)
+	throughput = Runtime.scheduler.throughput
+	Application.LogMessage("{0} | '{1}' requests processed per tick at most, '{2}' requests left in backlog.".format(
+	Constants.name, throughput["maximum"], throughput["backlog"]), siConstants.siInfo)
+	statistics = Runtime.requestsStack.statistics
+	Application.LogMessage(
+	"{0} | Requests queue high water mark: '{1}', '{2}' requests rejected, '{3}' requests dropped.".format(
+	Constants.name, statistics["highWaterMark"], statistics["rejected"], statistics["dropped"]), siConstants.siInfo)
+	statistics = Runtime.executor.cache.statistics
+	Application.LogMessage("{0} | Code cache: '{1}' entries, '{2}' hits, '{3}' misses.".format(
+	Constants.name, statistics["entries"], statistics["hits"], statistics["misses"]), siConstants.siInfo)
+	statistics = Runtime.scriptsCache.statistics
+	Application.LogMessage("{0} | Scripts cache: '{1}' entries, '{2}' bytes, '{3}' hits, '{4}' misses.".format(
+	Constants.name, statistics["entries"], statistics["size"], statistics["hits"], statistics["misses"]),
+	siConstants.siInfo)
+	snapshot = Runtime.metrics.getSnapshot()
+	for name, value in sorted(snapshot["counters"].items() + snapshot["gauges"].items()):
+		Application.LogMessage("{0} | Metrics: '{1}': '{2}'.".format(Constants.name, name, value), siConstants.siInfo)
+	for name, summary in sorted(snapshot["histograms"].items()):
+		Application.LogMessage("{0} | Metrics: '{1}': '{2}' samples, average: '{3:.3f}', p50: '{4:.3f}', \
+p99: '{5:.3f}', maximum: '{6:.3f}'.".format(Constants.name,
+											name,
+											summary["count"],
+											summary["average"],
+											summary["p50"],
+											summary["p99"],
+											summary["maximum"]), siConstants.siInfo)
+	return True
+
+def _getSocketPair():
+	# "socket.socketpair" definition is not available on Windows, a loopback connection is used instead.
+	if hasattr(socket, "socketpair"):
+		return socket.socketpair()
 
-		if getattr(object, "__uid__") == __uid__:
-			return object
+	listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+	try:
+		listener.bind(("127.0.0.1", 0))
+		listener.listen(1)
+		writer = socket.create_connection(listener.getsockname())
+		reader = listener.accept()[0]
+	finally:
+		listener.close()
+	return reader, writer
 
-def _getRequestsHandlers():
-	requestsHandlers = []
-	for object in sorted(globals().values()):
-		if not inspect.isclass(object):
+def _getLocalAddress(port):
+	# Local endpoints are named after the port so that clients do not need any other setting to find them.
+	if os.name == "nt":
+		return "\\\\.\\pipe\\{0}_{1}".format(Constants.name, port)
+
+	# "tempfile" module is slow to import and only needed by the local transport.
+	import tempfile
+	return os.path.join(tempfile.gettempdir(), "{0}_{1}.sock".format(Constants.name, port))
+
+def _removeLocalAddress(path):
+	# A socket file left over by a crashed session is removed, a socket file still served by a running server is kept
+	# so that binding it fails.
+	try:
+		if not stat.S_ISSOCK(os.stat(path).st_mode):
+			return False
+	except OSError:
+		return False
+
+	probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+	try:
+		probe.connect(path)
+		return False
+	except socket.error:
+		os.remove(path)
+		return True
+	finally:
+		probe.close()
+
+def _getUnicode(value):
+	# Byte strings returned by the executed code are not necessarily ASCII, they are decoded leniently.
+	try:
+		return unicode(value)
+	except UnicodeDecodeError:
+		return str(value).decode("utf-8", "replace")
+
+def _getText(data):
+	# Requests are expected to be "UTF-8" encoded, clients sending their "Windows" code page are decoded as "Latin-1"
+	# instead of having their requests dropped.
+	try:
+		return data.decode("utf-8")
+	except UnicodeDecodeError:
+		return data.decode("latin-1")
+
+def _getTime():
+	# "time.clock" is the high resolution timer on Windows.
+	return time.clock() if os.name == "nt" else time.time()
+
+def _getListeners(definitions):
+	# Listeners are defined as "Handler [Address:]Port [engine=Engine] [mode=Mode] [workers=Workers]
+	# [itemsBudget=Budget] [transport=Transport]" entries separated by semicolons, each listener having its own
+	# requests queue.
+	listeners = []
+	for definition in re.split(r"[;\n]", definitions):
+		fields = definition.split()
+		if not fields:
 			continue
 
-		if issubclass(object, SocketServer.BaseRequestHandler):
-			requestsHandlers.append(object)
+		try:
+			address, separator, port = fields[1].rpartition(":")
+			options = dict(field.split("=", 1) for field in fields[2:])
+			listeners.append(TCPServer(unicode(address or Runtime.address),
+										int(port),
+										Runtime.requestsHandlers.getHandler(fields[0]),
+										options.get("mode", Runtime.listenerMode),
+										int(options.get("workers", Runtime.workers)),
+										options.get("engine", Runtime.engine),
+										Runtime.idleTimeout,
+										RequestsQueue(Runtime.requestsStack.capacity,
+													Runtime.requestsStack.policy,
+													Runtime.requestsStack.deduplicationWindow,
+													Runtime.requestsStack.starvationTimeout),
+										int(options.get("itemsBudget", 0)),
+									options.get("transport", Runtime.transport)))
+		except (AssertionError, IndexError, KeyError, ValueError) as error:
+			Application.LogMessage("{0} | '{1}' listener definition is invalid and has been skipped: '{2}'!".format(
+			Constants.name, definition.strip(), error), siConstants.siWarning)
+	return listeners
 
-	return sorted(requestsHandlers, key=lambda x:x.__name__)
+def _processRequests():
+	# Handlers without "processRequest" definition are processed by their own "processData" definition.
+	sources = []
+	if hasattr(Runtime.requestsHandler, "processRequest"):
+		sources.append((Runtime.requestsStack, Runtime.requestsHandler.processRequest, 0))
+	else:
+		Runtime.requestsHandler.processData()
+	for server in Runtime.servers:
+		if hasattr(server.handler, "processRequest"):
+			sources.append((server.requestsStack, server.handler.processRequest, server.itemsBudget))
 
-	# Module introspection to retrieve the requests handlers classes.
-	# module = _getModule()
-	# requestsHandlers = []
-	# for attribute in dir(module):
-	# 	object = getattr(module, attribute)
-	# 	if not inspect.isclass(object):
-	# 		continue
-
-	# 	if issubclass(object, SocketServer.BaseRequestHandler):
-	# 		requestsHandlers.append(object)
-	# return sorted(requestsHandlers, key=lambda x:x.__name__)
+	Runtime.scheduler.dispatch(sources)
+	return any(source[0] for source in sources)
+
+def _stackRequest(data, identifier=0, flags=0, connection=None, key=None, priority=1, server=None, sharedBuffer=None):
+	requestsStack = getattr(server, "requestsStack", None)
+	requestsStack = Runtime.requestsStack if requestsStack is None else requestsStack
+	requestsStack.append(Request(data,
+								identifier,
+								flags,
+								connection,
+								key=key,
+								priority=priority,
+								sharedBuffer=sharedBuffer))
+	Runtime.metrics.increment("requestsStacked")
+	Runtime.metrics.gauge("queueDepth", len(requestsStack))
+	Runtime.scheduler.signal()
+	return True
+
+def _registerModule():
+	# The module object is looked up once when the plugin is loaded and registered under its unique identifier.
+	module = sys.modules.get(__name__)
+	if getattr(module, "__uid__", None) != __uid__:
+		import gc
+		modules = [referrer for referrer in gc.get_referrers(globals()) if isinstance(referrer, types.ModuleType)]
+		module = modules[0] if modules else None
+
+	if module is not None:
+		sys.modules[str("{0}_{1}".format(Constants.name, __uid__))] = module
+	return module
+
+def _getModule():
+	return sys.modules.get(str("{0}_{1}".format(Constants.name, __uid__)))
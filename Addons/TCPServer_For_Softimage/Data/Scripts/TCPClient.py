@@ -0,0 +1,756 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+**TCPClient.py
+
+**Platform:**
+	Windows, Linux, Mac Os X.
+
+**Description:**
+	| This module defines the :class:`ConnectionPool` class and other helpers objects needed to send **Python**
+	requests to one or more **TCPServer** instances running the **FramedStackDataRequestsHandler** requests handler.
+	| The pool keeps persistent connections opened, requests are pipelined on them and small requests issued at the
+	same time are sent in a single write. Broken connections are transparently reopened for the next requests.
+	| Requests larger than the server compression threshold are **zlib** compressed once the compression has been
+	negotiated on the connection.
+	| Requests sent with the :data:`BACKGROUND_FLAG` flag are executed by the server background workers instead of
+	the application main thread, they must not use the **Application** objects. Requests sent with the
+	:data:`BATCH_FLAG` flag are executed with the other requests of their server tick in a single undo entry and
+	viewports refresh.
+
+	Example client code:
+
+		>>> import TCPClient
+		>>> with TCPClient.ConnectionPool([("127.0.0.1", 12288)]) as pool:
+		...	pool.execute("import sys\\nsys.maxint")
+		...	pool.execute("sum(range(1024))", flags=TCPClient.BACKGROUND_FLAG)
+		...	futures = [pool.submit("Application.LogMessage('Pouet!')", TCPClient.LOW_PRIORITY_FLAG) for i in range(128)]
+		...	[future.result() for future in futures]
+		...	points = bytearray(1048576)
+		...	with TCPClient.SharedBuffer(len(points)) as sharedBuffer:
+		...		sharedBuffer.write(points)
+		...		pool.execute("len(sharedBuffer)", sharedBuffer=sharedBuffer)
+		2147483647
+		523776
+		[None, None, ...]
+		1048576
+
+**Others:**
+	This module does not depend on **Autodesk Softimage** and can be used from any **Python** interpreter.
+"""
+
+#**********************************************************************************************************************
+#***	Future imports.
+#**********************************************************************************************************************
+from __future__ import unicode_literals
+
+#**********************************************************************************************************************
+#***	External imports.
+#**********************************************************************************************************************
+import itertools
+import json
+import mmap
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+import zlib
+
+try:
+	import Queue
+except ImportError:
+	import queue as Queue
+
+#**********************************************************************************************************************
+#***	Module attributes.
+#**********************************************************************************************************************
+__author__ = "Thomas Mansencal"
+__copyright__ = "Copyright (C) 2008 - 2013 - Thomas Mansencal"
+__license__ = "GPL V3.0 - http://www.gnu.org/licenses/"
+__maintainer__ = "Thomas Mansencal"
+__email__ = "thomas.mansencal@gmail.com"
+__status__ = "Production"
+
+__all__ = ["HEADER",
+		"ERROR_FLAG",
+		"DIGEST_FLAG",
+		"STATISTICS_FLAG",
+		"KEY_FLAG",
+		"HIGH_PRIORITY_FLAG",
+		"LOW_PRIORITY_FLAG",
+		"SHARED_BUFFER_FLAG",
+		"HELLO_FLAG",
+		"COMPRESSED_FLAG",
+		"BACKGROUND_FLAG",
+		"BATCH_FLAG",
+		"ClientError",
+		"ClientConnectionError",
+		"ClientTimeoutError",
+		"RemoteError",
+		"Future",
+		"SharedBuffer",
+		"Connection",
+		"ConnectionPool"]
+
+HEADER = struct.Struct(b"!IIH")
+ERROR_FLAG = 0x0001
+DIGEST_FLAG = 0x0002
+STATISTICS_FLAG = 0x0004
+KEY_FLAG = 0x0008
+HIGH_PRIORITY_FLAG = 0x0010
+LOW_PRIORITY_FLAG = 0x0020
+SHARED_BUFFER_FLAG = 0x0040
+HELLO_FLAG = 0x0080
+COMPRESSED_FLAG = 0x0100
+BACKGROUND_FLAG = 0x0200
+BATCH_FLAG = 0x0400
+
+#**********************************************************************************************************************
+#***	Module classes and definitions.
+#**********************************************************************************************************************
+class ClientError(Exception):
+	"""
+	This class is the base class for client exceptions.
+	"""
+
+	pass
+
+class ClientConnectionError(ClientError):
+	"""
+	This class is used for connection exceptions.
+	"""
+
+	pass
+
+class ClientTimeoutError(ClientError):
+	"""
+	This class is used for timeout exceptions.
+	"""
+
+	pass
+
+class RemoteError(ClientError):
+	"""
+	This class is used for requests raising an exception on the server side.
+	"""
+
+	def __init__(self, message, response=None):
+		"""
+		This method initializes the class.
+
+		:param message: Exception message. ( String )
+		:param response: Server response. ( Dictionary )
+		"""
+
+		ClientError.__init__(self, message)
+
+		self.response = response
+
+class Future(object):
+	"""
+	This class holds the result of a request that has been sent but not yet answered.
+	"""
+
+	def __init__(self, identifier=0):
+		"""
+		This method initializes the class.
+
+		:param identifier: Request identifier. ( Integer )
+		"""
+
+		self.identifier = identifier
+		self.response = None
+
+		self.__event = threading.Event()
+		self.__exception = None
+		self.__callbacks = []
+		self.__lock = threading.Lock()
+
+	def done(self):
+		"""
+		This method returns if the request has been answered or has failed.
+
+		:return: Request done. ( Boolean )
+		"""
+
+		return self.__event.is_set()
+
+	def result(self, timeout=None):
+		"""
+		This method waits for the request response and returns the execution return value.
+
+		:param timeout: Timeout in seconds. ( Float )
+		:return: Execution return value. ( Object )
+		"""
+
+		if not self.__event.wait(timeout):
+			raise ClientTimeoutError("{0} | '{1}' request has not been answered within '{2}' seconds!".format(
+			self.__class__.__name__, self.identifier, timeout))
+
+		if self.__exception is not None:
+			raise self.__exception
+
+		if self.response.get("error"):
+			raise RemoteError(self.response["error"], self.response)
+
+		return self.response.get("value")
+
+	def exception(self, timeout=None):
+		"""
+		This method waits for the request response and returns the request exception if any.
+
+		:param timeout: Timeout in seconds. ( Float )
+		:return: Request exception. ( Exception )
+		"""
+
+		try:
+			self.result(timeout)
+		except ClientTimeoutError:
+			raise
+		except ClientError as error:
+			return error
+
+	def addDoneCallback(self, callback):
+		"""
+		This method adds a callback called with the future once the request is done.
+
+		:param callback: Callback. ( Callable )
+		"""
+
+		with self.__lock:
+			if not self.__event.is_set():
+				self.__callbacks.append(callback)
+				return
+		callback(self)
+
+	def setResponse(self, response):
+		"""
+		This method sets the request response.
+
+		:param response: Server response. ( Dictionary )
+		"""
+
+		self.response = response
+		self.__done()
+
+	def setException(self, exception):
+		"""
+		This method sets the request exception.
+
+		:param exception: Exception. ( Exception )
+		"""
+
+		self.__exception = exception
+		self.__done()
+
+	def __done(self):
+		"""
+		This method marks the request done and calls the callbacks.
+		"""
+
+		with self.__lock:
+			self.__event.set()
+			callbacks, self.__callbacks = self.__callbacks, []
+		for callback in callbacks:
+			callback(self)
+
+class SharedBuffer(object):
+	"""
+	This class is a memory mapped temporary file handed to the server instead of sending its content: The server maps
+	it and the executed code reads it through the **sharedBuffer** variable without any copy.
+	"""
+
+	def __init__(self, size, directory=None):
+		"""
+		This method initializes the class.
+
+		:param size: Buffer size in bytes. ( Integer )
+		:param directory: Temporary file directory. ( String )
+		"""
+
+		self.size = size
+
+		descriptor, self.path = tempfile.mkstemp(prefix="TCPClient_", suffix=".buffer", dir=directory)
+		self.__file = os.fdopen(descriptor, "r+b")
+		self.__file.truncate(max(1, size))
+		self.mapping = mmap.mmap(self.__file.fileno(), max(1, size))
+
+	def __enter__(self):
+		"""
+		This method is the context manager entry point.
+
+		:return: Shared buffer. ( SharedBuffer )
+		"""
+
+		return self
+
+	def __exit__(self, *arguments):
+		"""
+		This method is the context manager exit point, the temporary file is removed.
+		"""
+
+		self.close()
+
+	@property
+	def descriptor(self):
+		"""
+		This method returns the descriptor sent to the server.
+
+		:return: Descriptor. ( Dictionary )
+		"""
+
+		return {"path": self.path, "size": self.size}
+
+	def write(self, data, offset=0):
+		"""
+		This method writes given data into the buffer.
+
+		:param data: Data. ( Bytes )
+		:param offset: Offset in bytes. ( Integer )
+		"""
+
+		if offset + len(data) > self.size:
+			raise ClientError("{0} | '{1}' bytes do not fit in '{2}' bytes buffer at '{3}' offset!".format(
+			self.__class__.__name__, len(data), self.size, offset))
+
+		self.mapping[offset:offset + len(data)] = data
+
+	def close(self):
+		"""
+		This method unmaps the buffer and removes the temporary file, the requests using it need to be answered first.
+		"""
+
+		if self.mapping is None:
+			return
+
+		self.mapping.close()
+		self.mapping = None
+		self.__file.close()
+		os.remove(self.path)
+
+class Connection(object):
+	"""
+	This class is a persistent connection to a **TCPServer** instance: Requests are pipelined, a writer thread sends the
+	queued requests in batches while a reader thread dispatches the responses to their futures.
+	"""
+
+	batchSize = 65536
+	compressionLevel = 1
+
+	def __init__(self, address, port, timeout=10., compression=True):
+		"""
+		This method initializes the class.
+
+		:param address: Server address. ( String )
+		:param port: Server port. ( Integer )
+		:param timeout: Connection timeout in seconds. ( Float )
+		:param compression: Requests compression is negotiated with the server. ( Boolean )
+		"""
+
+		self.address = address
+		self.port = port
+		self.compressionThreshold = None
+		self.connections = 0
+
+		self.__socket = socket.create_connection((address, port), timeout)
+		self.__socket.settimeout(None)
+		self.__socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+		self.__identifiers = itertools.count(1)
+		self.__futures = {}
+		self.__lock = threading.Lock()
+		self.__requests = Queue.Queue()
+		self.__alive = True
+
+		for target in (self.__write, self.__read):
+			thread = threading.Thread(target=target)
+			thread.daemon = True
+			thread.start()
+
+		self.__negotiate(timeout, compression)
+
+	@property
+	def alive(self):
+		"""
+		This method is the property for **self.alive** attribute.
+
+		:return: Connection alive. ( Boolean )
+		"""
+
+		return self.__alive
+
+	@property
+	def pending(self):
+		"""
+		This method is the property for **self.pending** attribute.
+
+		:return: Requests waiting for a response. ( Integer )
+		"""
+
+		return len(self.__futures)
+
+	def submit(self, data, flags=0):
+		"""
+		This method sends given request data and returns its future.
+
+		:param data: Request data. ( String )
+		:param flags: Request flags. ( Integer )
+		:return: Request future. ( Future )
+		"""
+
+		if not isinstance(data, bytes):
+			data = data.encode("utf-8")
+
+		if self.compressionThreshold is not None and len(data) >= self.compressionThreshold:
+			data = zlib.compress(data, self.compressionLevel)
+			flags |= COMPRESSED_FLAG
+
+		with self.__lock:
+			if not self.__alive:
+				raise ClientConnectionError("{0} | Connection to '{1}:{2}' is closed!".format(
+				self.__class__.__name__, self.address, self.port))
+
+			identifier = next(self.__identifiers) & 0xFFFFFFFF
+			future = self.__futures[identifier] = Future(identifier)
+		self.__requests.put(HEADER.pack(len(data), identifier, flags) + data)
+		return future
+
+	def close(self):
+		"""
+		This method closes the connection, the pending requests fail.
+		"""
+
+		self.__fail(ClientConnectionError("{0} | Connection to '{1}:{2}' has been closed!".format(
+		self.__class__.__name__, self.address, self.port)))
+
+	def __negotiate(self, timeout, compression=True):
+		"""
+		This method negotiates the requests compression and retrieves the count of connections the server serves
+		concurrently, servers not supporting it execute the hello payload as a harmless expression.
+
+		:param timeout: Timeout in seconds. ( Float )
+		:param compression: Requests compression is negotiated. ( Boolean )
+		"""
+
+		try:
+			hello = json.dumps({"compression": ["zlib"] if compression else []})
+			value = self.submit(hello, HELLO_FLAG).result(timeout)
+		except ClientError:
+			return
+
+		if not isinstance(value, dict):
+			return
+
+		self.connections = int(value.get("connections") or 0)
+		if value.get("compression") == "zlib":
+			self.compressionThreshold = int(value.get("compressionThreshold") or 0)
+
+	def __write(self):
+		"""
+		This method sends the queued requests, concatenating the ones queued at the same time.
+		"""
+
+		while True:
+			frame = self.__requests.get()
+			if frame is None:
+				break
+
+			frames = [frame]
+			size = len(frame)
+			while size < self.batchSize:
+				try:
+					frame = self.__requests.get_nowait()
+				except Queue.Empty:
+					break
+
+				if frame is None:
+					self.__requests.put(None)
+					break
+
+				frames.append(frame)
+				size += len(frame)
+
+			try:
+				self.__socket.sendall(b"".join(frames))
+			except socket.error as error:
+				self.__fail(ClientConnectionError("{0} | Connection to '{1}:{2}' failed: '{3}'!".format(
+				self.__class__.__name__, self.address, self.port, error)))
+				break
+
+	def __read(self):
+		"""
+		This method reads the responses and dispatches them to their futures.
+		"""
+
+		stream = self.__socket.makefile("rb")
+		try:
+			while True:
+				header = stream.read(HEADER.size)
+				if len(header) < HEADER.size:
+					break
+
+				size, identifier, flags = HEADER.unpack(header)
+				payload = stream.read(size)
+				if len(payload) < size:
+					break
+
+				with self.__lock:
+					future = self.__futures.pop(identifier, None)
+				future and future.setResponse(json.loads(payload.decode("utf-8")))
+		except (socket.error, ValueError) as error:
+			self.__fail(ClientConnectionError("{0} | Connection to '{1}:{2}' failed: '{3}'!".format(
+			self.__class__.__name__, self.address, self.port, error)))
+		finally:
+			stream.close()
+
+		self.__fail(ClientConnectionError("{0} | Connection to '{1}:{2}' has been closed by the server!".format(
+		self.__class__.__name__, self.address, self.port)))
+
+	def __fail(self, exception):
+		"""
+		This method closes the connection and fails the pending requests with given exception.
+
+		:param exception: Exception. ( Exception )
+		"""
+
+		with self.__lock:
+			if not self.__alive:
+				return
+
+			self.__alive = False
+			futures, self.__futures = self.__futures, {}
+
+		self.__requests.put(None)
+		try:
+			self.__socket.shutdown(socket.SHUT_RDWR)
+		except socket.error:
+			pass
+		self.__socket.close()
+
+		for future in futures.values():
+			future.setException(exception)
+
+class ConnectionPool(object):
+	"""
+	This class maintains a pool of persistent connections to one or more **TCPServer** instances, requests are
+	distributed on the least busy connections and broken connections are reopened.
+	"""
+
+	def __init__(self,
+				servers=(("127.0.0.1", 12288),),
+				size=4,
+				timeout=10.,
+				retries=3,
+				retryDelay=0.1,
+				compression=True):
+		"""
+		This method initializes the class.
+
+		:param servers: Servers addresses and ports. ( Tuple / List )
+		:param size: Connections count per server. ( Integer )
+		:param timeout: Connection timeout in seconds. ( Float )
+		:param retries: Connection attempts before a request fails. ( Integer )
+		:param retryDelay: Delay in seconds between two connection attempts, doubled after each one. ( Float )
+		:param compression: Large requests are compressed when the servers support it. ( Boolean )
+		"""
+
+		self.servers = [tuple(server) for server in servers]
+		self.size = size
+		self.timeout = timeout
+		self.retries = retries
+		self.retryDelay = retryDelay
+		self.compression = compression
+
+		self.__slots = [[server, None] for i in range(size) for server in self.servers]
+		self.__capacities = {}
+		self.__opening = set()
+		self.__lock = threading.Condition()
+
+	def __enter__(self):
+		"""
+		This method is the context manager entry point.
+
+		:return: Pool. ( ConnectionPool )
+		"""
+
+		return self
+
+	def __exit__(self, *arguments):
+		"""
+		This method is the context manager exit point, the connections are closed.
+		"""
+
+		self.close()
+
+	def submit(self, code, flags=0, key=None, sharedBuffer=None):
+		"""
+		This method sends given **Python** code and returns its future.
+
+		:param code: Code. ( String )
+		:param flags: Request flags. ( Integer )
+		:param key: Coalescing key, a pending request with the same key is superseded by this one. ( String )
+		:param sharedBuffer: Buffer bound to the **sharedBuffer** variable during the code execution. ( SharedBuffer )
+		:return: Request future. ( Future )
+		"""
+
+		if sharedBuffer is not None:
+			descriptor = json.dumps(sharedBuffer.descriptor).encode("utf-8")
+			if not isinstance(code, bytes):
+				code = code.encode("utf-8")
+			code = struct.pack(b"!H", len(descriptor)) + descriptor + code
+			flags |= SHARED_BUFFER_FLAG
+
+		if key is not None:
+			key = key.encode("utf-8")
+			if len(key) > 255:
+				raise ClientError("{0} | '{1}' key is longer than 255 bytes!".format(self.__class__.__name__, key))
+
+			if not isinstance(code, bytes):
+				code = code.encode("utf-8")
+			code = struct.pack(b"!B", len(key)) + key + code
+			flags |= KEY_FLAG
+
+		delay = self.retryDelay
+		for attempt in range(max(1, self.retries)):
+			try:
+				return self.__getConnection().submit(code, flags)
+			except (socket.error, ClientConnectionError) as error:
+				exception = error
+				time.sleep(delay)
+				delay *= 2
+		raise ClientConnectionError("{0} | Request could not be sent after '{1}' attempts: '{2}'!".format(
+		self.__class__.__name__, max(1, self.retries), exception))
+
+	def execute(self, code, timeout=None, key=None, sharedBuffer=None, flags=0):
+		"""
+		This method executes given **Python** code and waits for its return value.
+
+		:param code: Code. ( String )
+		:param timeout: Timeout in seconds. ( Float )
+		:param key: Coalescing key. ( String )
+		:param sharedBuffer: Buffer bound to the **sharedBuffer** variable during the code execution. ( SharedBuffer )
+		:param flags: Request flags. ( Integer )
+		:return: Execution return value. ( Object )
+		"""
+
+		return self.submit(code, flags, key, sharedBuffer).result(timeout)
+
+	def executeMany(self, codes, timeout=None):
+		"""
+		This method pipelines given **Python** codes and waits for their return values.
+
+		:param codes: Codes. ( List )
+		:param timeout: Timeout in seconds for all the codes. ( Float )
+		:return: Execution return values. ( List )
+		"""
+
+		futures = [self.submit(code) for code in codes]
+		deadline = None if timeout is None else time.time() + timeout
+		return [future.result(None if deadline is None else max(0., deadline - time.time())) for future in futures]
+
+	def executeDigest(self, digest, timeout=None):
+		"""
+		This method executes the server cached code with given digest and waits for its return value.
+
+		:param digest: Code digest. ( String )
+		:param timeout: Timeout in seconds. ( Float )
+		:return: Execution return value. ( Object )
+		"""
+
+		return self.submit(digest, DIGEST_FLAG).result(timeout)
+
+	def getStatistics(self, timeout=None):
+		"""
+		This method returns the server statistics.
+
+		:param timeout: Timeout in seconds. ( Float )
+		:return: Server statistics. ( Dictionary )
+		"""
+
+		return self.submit("", STATISTICS_FLAG).result(timeout)
+
+	def close(self):
+		"""
+		This method closes the pool connections.
+		"""
+
+		with self.__lock:
+			for slot in self.__slots:
+				slot[1] and slot[1].close()
+				slot[1] = None
+
+	def __getConnection(self):
+		"""
+		This method returns the least busy alive connection, opening a connection in an empty slot if needed.
+
+		Connections are opened outside the pool lock, one at a time per server until the server advertised how many
+		connections it serves concurrently: A server in **Single** listener mode only serves one connection at a time
+		and the requests sent on the other ones would never be answered.
+
+		:return: Connection. ( Connection )
+		"""
+
+		unreachable = set()
+		while True:
+			with self.__lock:
+				while True:
+					slots = [slot for slot in self.__slots if slot[1] is not None and slot[1].alive]
+					idle = [slot for slot in slots if not slot[1].pending]
+					if idle:
+						return idle[0][1]
+
+					slot = self.__getEmptySlot(slots, unreachable)
+					if slot is not None:
+						break
+
+					if slots:
+						return min(slots, key=lambda slot: slot[1].pending)[1]
+
+					if not self.__opening - unreachable:
+						raise ClientConnectionError("{0} | No connection could be opened!".format(
+						self.__class__.__name__))
+
+					self.__lock.wait()
+
+				server = slot[0]
+				slot[1] = None
+				self.__opening.add(server)
+
+			connection = None
+			try:
+				connection = Connection(server[0], server[1], self.timeout, self.compression)
+			except socket.error:
+				unreachable.add(server)
+			finally:
+				with self.__lock:
+					self.__opening.discard(server)
+					if connection is not None:
+						slot[1] = connection
+						self.__capacities[server] = connection.connections
+					self.__lock.notify_all()
+
+			if connection is not None:
+				return connection
+
+	def __getEmptySlot(self, slots, unreachable):
+		"""
+		This method returns an empty slot of a reachable server whose capacity is not reached.
+
+		:param slots: Alive connections slots. ( List )
+		:param unreachable: Unreachable servers. ( Set )
+		:return: Slot. ( List )
+		"""
+
+		for slot in self.__slots:
+			server = slot[0]
+			if slot[1] is not None and slot[1].alive or server in unreachable or server in self.__opening:
+				continue
+
+			capacity = self.__capacities.get(server, 0)
+			if capacity and len([alive for alive in slots if alive[0] == server]) >= capacity:
+				continue
+
+			return slot
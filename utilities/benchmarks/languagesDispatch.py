@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+**languagesDispatch.py
+
+**Platform:**
+	Windows, Linux, Mac Os X.
+
+**Description:**
+	Measures the :class:`DefaultStackDataRequestsHandler` class per request dispatch cost, comparing the legacy
+	per language regular expressions loop with the precompiled :class:`LanguagesDispatcher` class.
+
+**Others:**
+
+"""
+
+#**********************************************************************************************************************
+#***	Future imports.
+#**********************************************************************************************************************
+from __future__ import unicode_literals
+
+#**********************************************************************************************************************
+#***	External imports.
+#**********************************************************************************************************************
+import os
+import re
+import sys
+import timeit
+
+#**********************************************************************************************************************
+#***	Internal imports.
+#**********************************************************************************************************************
+import softimageStubs
+
+#**********************************************************************************************************************
+#***	Module attributes.
+#**********************************************************************************************************************
+__author__ = "Thomas Mansencal"
+__copyright__ = "Copyright (C) 2008 - 2013 - Thomas Mansencal"
+__license__ = "GPL V3.0 - http://www.gnu.org/licenses/"
+__maintainer__ = "Thomas Mansencal"
+__email__ = "thomas.mansencal@gmail.com"
+__status__ = "Production"
+
+__all__ = ["ITERATIONS",
+		"PAYLOADS",
+		"legacyProcessRequest",
+		"benchmark",
+		"languagesDispatch"]
+
+ITERATIONS = 100000
+
+PAYLOADS = ("VBScript | LogMessage \"Pouet\"",
+			"JScript | LogMessage(\"Pouet\")",
+			"PythonScript | Application.LogMessage(\"Pouet\")",
+			"PerlScript | $Application->LogMessage(\"Pouet\");",
+			"Unknown | Pouet")
+
+#**********************************************************************************************************************
+#***	Module classes and definitions.
+#**********************************************************************************************************************
+def legacyProcessRequest(module, data):
+	"""
+	This definition reproduces the legacy :class:`DefaultStackDataRequestsHandler` class dispatch.
+
+	:param module: Plugin module. ( Module )
+	:param data: Request data. ( String )
+	"""
+
+	data = data.strip()
+	if os.path.exists(data):
+		value = module.Application.ExecuteScript(data)
+		module.Application.LogMessage("{0} | Request return value: '{1}'.".format(
+		module.Constants.name, value), module.siConstants.siVerbose)
+	else:
+		for language in module.Constants.languages:
+			match = re.match(r"\s*(?P<language>{0})\s*\|(?P<code>.*)".format(language), data)
+			if match:
+				value = module.Application.ExecuteScriptCode(match.group("code"), match.group("language"))
+				module.Application.LogMessage("{0} | Request return value: '{1}'.".format(
+				module.Constants.name, value), module.siConstants.siVerbose)
+				break
+
+def benchmark(processor, iterations=ITERATIONS):
+	"""
+	This definition returns given processor per request cost.
+
+	:param processor: Processor. ( Callable )
+	:param iterations: Iterations count. ( Integer )
+	:return: Per request cost in micro-seconds. ( Float )
+	"""
+
+	return min(timeit.repeat(processor, number=iterations, repeat=3)) / iterations * 1000000.
+
+def languagesDispatch(iterations=ITERATIONS):
+	"""
+	This definition runs the languages dispatch benchmark.
+
+	:param iterations: Iterations count. ( Integer )
+	"""
+
+	module = softimageStubs.loadPlugin()
+	processRequest = module.DefaultStackDataRequestsHandler.processRequest
+	for data in PAYLOADS:
+		request = module.Request(data)
+		legacy = benchmark(lambda: legacyProcessRequest(module, data), iterations)
+		current = benchmark(lambda: processRequest(request), iterations)
+		sys.stdout.write("{0:<64} legacy: {1:8.3f} us, current: {2:8.3f} us, speedup: {3:6.2f}x\n".format(
+		"'{0}'".format(data), legacy, current, legacy / current))
+
+if __name__ == "__main__":
+	languagesDispatch(int(sys.argv[1]) if len(sys.argv) > 1 else ITERATIONS)
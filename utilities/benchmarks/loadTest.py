@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+**loadTest.py
+
+**Platform:**
+	Windows, Linux, Mac Os X.
+
+**Description:**
+	Loads the **TCPServer** plugin module with stand-in **Autodesk Softimage** objects, drives it with concurrent local
+	clients for each requests handler and reports throughput, enqueue to execute latency and memory usage.
+
+**Others:**
+
+"""
+
+#**********************************************************************************************************************
+#***	Future imports.
+#**********************************************************************************************************************
+from __future__ import unicode_literals
+
+#**********************************************************************************************************************
+#***	External imports.
+#**********************************************************************************************************************
+import argparse
+import socket
+import struct
+import sys
+import threading
+import time
+
+#**********************************************************************************************************************
+#***	Internal imports.
+#**********************************************************************************************************************
+import softimageStubs
+
+#**********************************************************************************************************************
+#***	Module attributes.
+#**********************************************************************************************************************
+__author__ = "Thomas Mansencal"
+__copyright__ = "Copyright (C) 2008 - 2013 - Thomas Mansencal"
+__license__ = "GPL V3.0 - http://www.gnu.org/licenses/"
+__maintainer__ = "Thomas Mansencal"
+__email__ = "thomas.mansencal@gmail.com"
+__status__ = "Production"
+
+__all__ = ["ADDRESS",
+		"PORT",
+		"HANDLERS",
+		"TimerEvent",
+		"Context",
+		"Dispatcher",
+		"getPercentile",
+		"getMemoryUsage",
+		"echoClient",
+		"streamClient",
+		"pythonClient",
+		"framedClient",
+		"loadTest"]
+
+ADDRESS = "127.0.0.1"
+PORT = 12288
+
+#**********************************************************************************************************************
+#***	Module classes and definitions.
+#**********************************************************************************************************************
+class TimerEvent(object):
+	"""
+	This class is a stand-in for the **Autodesk Softimage** timer event object.
+	"""
+
+	def __init__(self, interval):
+		"""
+		This method initializes the class.
+
+		:param interval: Interval in milliseconds. ( Integer )
+		"""
+
+		self.interval = interval
+
+	def Reset(self, interval, delay):
+		"""
+		This method resets the timer interval.
+
+		:param interval: Interval in milliseconds. ( Integer )
+		:param delay: Delay in milliseconds. ( Integer )
+		"""
+
+		self.interval = interval
+
+class Context(object):
+	"""
+	This class is a stand-in for the **Autodesk Softimage** event context object.
+	"""
+
+	def __init__(self, source):
+		"""
+		This method initializes the class.
+
+		:param source: Event source. ( TimerEvent )
+		"""
+
+		self.Source = source
+
+class Dispatcher(threading.Thread):
+	"""
+	This class emulates the **Autodesk Softimage** main thread firing the plugin timer event.
+	"""
+
+	def __init__(self, module):
+		"""
+		This method initializes the class.
+
+		:param module: Plugin module. ( Module )
+		"""
+
+		threading.Thread.__init__(self)
+		self.setDaemon(True)
+
+		self.module = module
+		self.context = Context(TimerEvent(module.Constants.defaultMinimumInterval))
+		self.running = True
+
+	def run(self):
+		"""
+		This method fires the timer event until stopped.
+		"""
+
+		while self.running:
+			self.module.TCPServer_timerEvent_OnEvent(self.context)
+			time.sleep(self.context.Source.interval / 1000.)
+
+def getPercentile(values, percentile):
+	"""
+	This definition returns given values percentile.
+
+	:param values: Values. ( List )
+	:param percentile: Percentile. ( Float )
+	:return: Percentile value. ( Float )
+	"""
+
+	if not values:
+		return 0.
+
+	values = sorted(values)
+	return values[min(len(values) - 1, int(len(values) * percentile / 100.))]
+
+def getMemoryUsage():
+	"""
+	This definition returns the process peak memory usage in megabytes if available.
+
+	:return: Peak memory usage. ( Float )
+	"""
+
+	try:
+		import resource
+	except ImportError:
+		return float("nan")
+
+	usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	return usage / (1024. * 1024.) if sys.platform == "darwin" else usage / 1024.
+
+def echoClient(port, requests, latencies):
+	"""
+	This definition sends given requests count to the :class:`EchoRequestsHandler` class and waits for the echoes.
+
+	:param port: Server port. ( Integer )
+	:param requests: Requests count. ( Integer )
+	:param latencies: Round trip latencies. ( List )
+	"""
+
+	connection = socket.create_connection((ADDRESS, port))
+	for i in range(requests):
+		start = time.time()
+		connection.sendall(b"Hello World!")
+		received = 0
+		while received < 12:
+			received += len(connection.recv(1024))
+		latencies.append((time.time() - start) * 1000.)
+	connection.close()
+
+def streamClient(port, requests, latencies):
+	"""
+	This definition sends given requests count to the stream handlers, one connection per request as those handlers
+	consider each received chunk as a request.
+
+	:param port: Server port. ( Integer )
+	:param requests: Requests count. ( Integer )
+	:param latencies: Unused. ( List )
+	"""
+
+	for i in range(requests):
+		connection = socket.create_connection((ADDRESS, port))
+		connection.sendall(b"JScript | LogMessage(\"Pouet!\")")
+		connection.close()
+
+def pythonClient(port, requests, latencies):
+	"""
+	This definition pipelines given requests count to the :class:`PythonStackDataRequestsHandler` class on a single
+	kept alive connection.
+
+	:param port: Server port. ( Integer )
+	:param requests: Requests count. ( Integer )
+	:param latencies: Unused. ( List )
+	"""
+
+	connection = socket.create_connection((ADDRESS, port))
+	connection.sendall(b"<!KA>")
+	for i in range(requests):
+		connection.sendall(b"import sys\nsys.maxint<!RE>")
+	connection.close()
+
+def framedClient(port, requests, latencies):
+	"""
+	This definition pipelines given requests count to the :class:`FramedStackDataRequestsHandler` class on a single
+	connection and waits for the responses.
+
+	:param port: Server port. ( Integer )
+	:param requests: Requests count. ( Integer )
+	:param latencies: Round trip latencies. ( List )
+	"""
+
+	header = struct.Struct(b"!IIH")
+	payload = b"import sys\nsys.maxint"
+	connection = socket.create_connection((ADDRESS, port))
+	starts = {}
+	for i in range(requests):
+		starts[i] = time.time()
+		connection.sendall(header.pack(len(payload), i, 0) + payload)
+
+	stream = connection.makefile("rb")
+	for i in range(requests):
+		size, identifier, flags = header.unpack(stream.read(header.size))
+		stream.read(size)
+		latencies.append((time.time() - starts[identifier]) * 1000.)
+	connection.close()
+
+HANDLERS = (("EchoRequestsHandler", echoClient),
+			("LoggingStackDataRequestsHandler", streamClient),
+			("DefaultStackDataRequestsHandler", streamClient),
+			("PythonStackDataRequestsHandler", pythonClient),
+			("FramedStackDataRequestsHandler", framedClient))
+
+def loadTest(clients=32, requests=100, port=PORT, timeout=60., engine="SocketServer"):
+	"""
+	This definition runs the load test on each requests handler.
+
+	:param clients: Concurrent clients count. ( Integer )
+	:param requests: Requests count per client. ( Integer )
+	:param port: Server port. ( Integer )
+	:param timeout: Per handler timeout in seconds once the requests are sent. ( Float )
+	:param engine: Server engine. ( String )
+	"""
+
+	application = softimageStubs.Application()
+	module = softimageStubs.loadPlugin(application)
+
+	# Exact enqueue to execute latencies are collected in addition of the plugin binned histograms.
+	latencies = []
+	addLatency = module.Runtime.scheduler.addLatency
+	def collectLatency(request):
+		latency = addLatency(request)
+		latencies.append(latency)
+		return latency
+	module.Runtime.scheduler.addLatency = collectLatency
+
+	sys.stdout.write("{0} clients, {1} requests per client, '{2}' engine.\n".format(clients, requests, engine))
+	for name, client in HANDLERS:
+		handler = getattr(module, name)
+		module.Runtime.requestsHandler = handler
+		del latencies[:]
+		roundTrips = []
+
+		server = module.TCPServer(ADDRESS, port, handler, "ThreadPool", clients, engine)
+		server.start()
+		dispatcher = Dispatcher(module)
+		dispatcher.start()
+
+		start = time.time()
+		threads = [threading.Thread(target=client, args=(port, requests, roundTrips)) for i in range(clients)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+
+		expected = 0 if handler is module.EchoRequestsHandler else clients * requests
+		sent = time.time()
+		while len(latencies) < expected and time.time() - sent < timeout:
+			time.sleep(0.001)
+		elapsed = time.time() - start
+
+		dispatcher.running = False
+		dispatcher.join()
+		server.stop()
+		module.Runtime.requestsStack.clear()
+
+		executed = len(latencies) if expected else len(roundTrips)
+		sys.stdout.write("{0:<34} {1:>8} requests, {2:>10.1f} requests/s, latency p50: {3:>8.3f} ms, \
+p99: {4:>8.3f} ms, round trip p50: {5:>8.3f} ms, p99: {6:>8.3f} ms, peak memory: {7:>8.1f} MB\n".format(
+		name,
+		executed,
+		executed / elapsed,
+		getPercentile(latencies, 50),
+		getPercentile(latencies, 99),
+		getPercentile(roundTrips, 50),
+		getPercentile(roundTrips, 99),
+		getMemoryUsage()))
+		port += 1
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="TCPServer load test.")
+	parser.add_argument("-c", "--clients", type=int, default=32, help="Concurrent clients count.")
+	parser.add_argument("-r", "--requests", type=int, default=100, help="Requests count per client.")
+	parser.add_argument("-p", "--port", type=int, default=PORT, help="First server port.")
+	parser.add_argument("-e", "--engine", default="SocketServer", help="Server engine.")
+	arguments = parser.parse_args()
+
+	loadTest(arguments.clients, arguments.requests, arguments.port, engine=arguments.engine)
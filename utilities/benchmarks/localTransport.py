@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+**localTransport.py
+
+**Platform:**
+	Windows, Linux, Mac Os X.
+
+**Description:**
+	Compares the **TCP** and **Local** transports of the **TCPServer** plugin module using the
+	:class:`EchoRequestsHandler` class: Small requests round trip latency and bulk throughput on a single connection.
+
+**Others:**
+
+"""
+
+#**********************************************************************************************************************
+#***	Future imports.
+#**********************************************************************************************************************
+from __future__ import unicode_literals
+
+#**********************************************************************************************************************
+#***	External imports.
+#**********************************************************************************************************************
+import argparse
+import io
+import os
+import socket
+import sys
+import time
+
+#**********************************************************************************************************************
+#***	Internal imports.
+#**********************************************************************************************************************
+import softimageStubs
+from loadTest import getPercentile
+
+#**********************************************************************************************************************
+#***	Module attributes.
+#**********************************************************************************************************************
+__author__ = "Thomas Mansencal"
+__copyright__ = "Copyright (C) 2008 - 2013 - Thomas Mansencal"
+__license__ = "GPL V3.0 - http://www.gnu.org/licenses/"
+__maintainer__ = "Thomas Mansencal"
+__email__ = "thomas.mansencal@gmail.com"
+__status__ = "Production"
+
+__all__ = ["ADDRESS",
+		"PORT",
+		"PipeConnection",
+		"connect",
+		"receive",
+		"roundTrips",
+		"bulk",
+		"localTransport"]
+
+ADDRESS = "127.0.0.1"
+PORT = 12388
+
+#**********************************************************************************************************************
+#***	Module classes and definitions.
+#**********************************************************************************************************************
+class PipeConnection(object):
+	"""
+	This class provides the socket methods used by the benchmark on top of a Windows named pipe.
+	"""
+
+	def __init__(self, path):
+		"""
+		This method initializes the class.
+
+		:param path: Named pipe path. ( String )
+		"""
+
+		self.file = io.open(path, "r+b", buffering=0)
+
+	def sendall(self, data):
+		"""
+		This method writes given data.
+
+		:param data: Data. ( Bytes )
+		"""
+
+		self.file.write(data)
+
+	def recv(self, size):
+		"""
+		This method reads up to given size data.
+
+		:param size: Size. ( Integer )
+		:return: Data. ( Bytes )
+		"""
+
+		return self.file.read(size)
+
+	def close(self):
+		"""
+		This method closes the pipe.
+		"""
+
+		self.file.close()
+
+def connect(module, transport, port):
+	"""
+	This definition connects to the server using given transport.
+
+	:param module: Plugin module. ( Module )
+	:param transport: Transport. ( String )
+	:param port: Server port. ( Integer )
+	:return: Connection. ( Object )
+	"""
+
+	if transport != "Local":
+		connection = socket.create_connection((ADDRESS, port))
+		connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+		return connection
+
+	if os.name == "nt":
+		return PipeConnection(module._getLocalAddress(port))
+
+	connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+	connection.connect(module._getLocalAddress(port))
+	return connection
+
+def receive(connection, size):
+	"""
+	This definition receives given size data.
+
+	:param connection: Connection. ( Object )
+	:param size: Size. ( Integer )
+	"""
+
+	received = 0
+	while received < size:
+		data = connection.recv(min(65536, size - received))
+		if not data:
+			raise IOError("Connection closed after '{0}' bytes!".format(received))
+		received += len(data)
+
+def roundTrips(connection, requests, size):
+	"""
+	This definition sends given requests count with given payload size and waits for each echo.
+
+	:param connection: Connection. ( Object )
+	:param requests: Requests count. ( Integer )
+	:param size: Payload size. ( Integer )
+	:return: Round trip latencies. ( List )
+	"""
+
+	payload = b"x" * size
+	latencies = []
+	for i in range(requests):
+		start = time.time()
+		connection.sendall(payload)
+		receive(connection, size)
+		latencies.append((time.time() - start) * 1000.)
+	return latencies
+
+def bulk(connection, size, chunkSize):
+	"""
+	This definition sends given data size in chunks, waiting for each chunk echo.
+
+	:param connection: Connection. ( Object )
+	:param size: Data size in bytes. ( Integer )
+	:param chunkSize: Chunk size in bytes. ( Integer )
+	:return: Throughput in megabytes per second. ( Float )
+	"""
+
+	chunk = b"x" * chunkSize
+	start = time.time()
+	for i in range(size // chunkSize):
+		connection.sendall(chunk)
+		receive(connection, chunkSize)
+	return size / (1024. * 1024.) / (time.time() - start)
+
+def localTransport(requests=10000, size=64, bulkSize=256, port=PORT, engine="SocketServer"):
+	"""
+	This definition runs the transports benchmark.
+
+	:param requests: Round trips count. ( Integer )
+	:param size: Round trips payload size in bytes. ( Integer )
+	:param bulkSize: Bulk data size in megabytes. ( Integer )
+	:param port: Server port. ( Integer )
+	:param engine: Server engine. ( String )
+	"""
+
+	module = softimageStubs.loadPlugin()
+
+	sys.stdout.write("{0} round trips of {1} bytes, {2} MB bulk transfer, '{3}' engine.\n".format(
+	requests, size, bulkSize, engine))
+	for transport in module.Constants.transports:
+		server = module.TCPServer(ADDRESS, port, module.EchoRequestsHandler, engine=engine, transport=transport)
+		server.start()
+
+		connection = connect(module, transport, port)
+		latencies = roundTrips(connection, requests, size)
+		throughput = bulk(connection, bulkSize * 1024 * 1024, 65536)
+		connection.close()
+		server.stop()
+
+		sys.stdout.write("{0:<8} round trip p50: {1:>8.3f} ms, p99: {2:>8.3f} ms, bulk: {3:>10.1f} MB/s\n".format(
+		transport, getPercentile(latencies, 50), getPercentile(latencies, 99), throughput))
+		port += 1
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="TCPServer transports benchmark.")
+	parser.add_argument("-r", "--requests", type=int, default=10000, help="Round trips count.")
+	parser.add_argument("-s", "--size", type=int, default=64, help="Round trips payload size in bytes.")
+	parser.add_argument("-b", "--bulk", type=int, default=256, help="Bulk data size in megabytes.")
+	parser.add_argument("-p", "--port", type=int, default=PORT, help="First server port.")
+	parser.add_argument("-e", "--engine", default="SocketServer", help="Server engine.")
+	arguments = parser.parse_args()
+
+	localTransport(arguments.requests, arguments.size, arguments.bulk, arguments.port, arguments.engine)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+**softimageStubs.py
+
+**Platform:**
+	Windows, Linux, Mac Os X.
+
+**Description:**
+	Defines stand-in objects for the **Autodesk Softimage** environment so that the **TCPServer** plugin module can be
+	loaded and exercised outside of the application.
+
+**Others:**
+
+"""
+
+#**********************************************************************************************************************
+#***	Future imports.
+#**********************************************************************************************************************
+from __future__ import unicode_literals
+
+#**********************************************************************************************************************
+#***	External imports.
+#**********************************************************************************************************************
+import imp
+import os
+import sys
+import threading
+
+#**********************************************************************************************************************
+#***	Module attributes.
+#**********************************************************************************************************************
+__author__ = "Thomas Mansencal"
+__copyright__ = "Copyright (C) 2008 - 2013 - Thomas Mansencal"
+__license__ = "GPL V3.0 - http://www.gnu.org/licenses/"
+__maintainer__ = "Thomas Mansencal"
+__email__ = "thomas.mansencal@gmail.com"
+__status__ = "Production"
+
+__all__ = ["PLUGIN_FILE",
+		"Constants",
+		"Application",
+		"loadPlugin"]
+
+PLUGIN_FILE = os.path.join(os.path.dirname(__file__),
+						"..",
+						"..",
+						"Addons",
+						"TCPServer_For_Softimage",
+						"Application",
+						"Plugins",
+						"TCPServer.py")
+
+#**********************************************************************************************************************
+#***	Module classes and definitions.
+#**********************************************************************************************************************
+class Constants(object):
+	"""
+	This class is a stand-in for the **win32com.client.constants** object: Any attribute resolves to its own name.
+	"""
+
+	def __getattr__(self, attribute):
+		"""
+		This method returns given attribute name.
+
+		:param attribute: Attribute. ( String )
+		:return: Attribute name. ( String )
+		"""
+
+		if attribute.startswith("__"):
+			raise AttributeError(attribute)
+
+		return attribute
+
+class Application(object):
+	"""
+	This class is a stand-in for the **Autodesk Softimage** **Application** object.
+	"""
+
+	def __init__(self, verbose=False):
+		"""
+		This method initializes the class.
+
+		:param verbose: Messages are printed. ( Boolean )
+		"""
+
+		self.verbose = verbose
+		self.executed = 0
+		self.lock = threading.Lock()
+
+	def LogMessage(self, message, level=None):
+		"""
+		This method logs given message.
+
+		:param message: Message. ( String )
+		:param level: Message level. ( String )
+		"""
+
+		if self.verbose:
+			sys.stdout.write("{0}\n".format(message))
+
+	def ExecuteScriptCode(self, code, language, *arguments):
+		"""
+		This method stands for code execution: It only counts the executed requests.
+
+		:param code: Code. ( String )
+		:param language: Code language. ( String )
+		:return: Executed requests count. ( Integer )
+		"""
+
+		with self.lock:
+			self.executed += 1
+		return self.executed
+
+	def ExecuteScript(self, path, *arguments):
+		"""
+		This method stands for script execution: It only counts the executed requests.
+
+		:param path: Script path. ( String )
+		:return: Executed requests count. ( Integer )
+		"""
+
+		with self.lock:
+			self.executed += 1
+		return self.executed
+
+def loadPlugin(application=None, path=PLUGIN_FILE):
+	"""
+	This definition loads the **TCPServer** plugin module with stand-in **Autodesk Softimage** objects.
+
+	:param application: Application stand-in. ( Application )
+	:param path: Plugin path. ( String )
+	:return: Plugin module. ( Module )
+	"""
+
+	if "win32com.client" not in sys.modules:
+		win32com = imp.new_module(str("win32com"))
+		win32com.client = imp.new_module(str("win32com.client"))
+		win32com.client.constants = Constants()
+		sys.modules[str("win32com")] = win32com
+		sys.modules[str("win32com.client")] = win32com.client
+
+	module = imp.new_module(str("TCPServer"))
+	module.__file__ = path
+	# Softimage injects those objects into the plugin module namespace.
+	module.Application = application or Application()
+	module.__sipath__ = os.path.dirname(path)
+	with open(path) as file:
+		exec compile(file.read(), path, "exec") in module.__dict__
+	return module